@@ -6,89 +6,275 @@
 """
 
 import os
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# orjson.JSONDecodeError 继承自 json.JSONDecodeError，两种实现可统一捕获
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
+
+def _json_loads(data: bytes) -> Any:
+    """解析JSON字节串（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """将对象序列化为两空格缩进的UTF-8 JSON字节串（优先使用orjson，两种实现输出一致）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# MessagePack配置文件后缀（配置文件名使用此后缀时以MessagePack存储，默认仍为JSON）
+_MSGPACK_SUFFIX = '.msgpack'
+
+def _decode_config(file_path: str, data: bytes) -> Any:
+    """按文件后缀解析配置数据（.msgpack 使用MessagePack，其余按JSON）"""
+    if file_path.endswith(_MSGPACK_SUFFIX):
+        return msgpack.unpackb(data, raw=False)
+    return _json_loads(data)
+
+def _encode_config(file_path: str, obj: Any) -> bytes:
+    """按文件后缀序列化配置数据"""
+    if file_path.endswith(_MSGPACK_SUFFIX):
+        return msgpack.packb(obj, use_bin_type=True)
+    return _json_dumps(obj)
+
+def _write_atomic(file_path: str, data: bytes):
+    """原子写入文件：整块写入临时文件后替换目标文件，避免中途失败留下残缺文件"""
+    tmp_path = file_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# 配置项缺失标记（区分缺失与值为None）
+_MISSING = object()
+
+# 空的只读配置节（get_section 查询不存在的节时返回）
+_EMPTY_DICT = MappingProxyType({})
+
+# 默认配置（只读视图，重置时通过 _copy_defaults 获取独立副本）
+_DEFAULT_CONFIG = MappingProxyType({
+    "app": {
+        "theme": "default",
+        "language": "zh_CN",
+        "auto_save": True,
+        "remember_last_folder": True,
+        "output_folder_suffix": "_processed"
+    },
+    "watermark": {
+        "text": "MU Group Leo: +86 13819858718",
+        "font_size": 40,
+        "opacity": 80,
+        "color": [255, 255, 0],
+        "position": "中心",
+        "multi_size": True,
+        "high_contrast": True,
+        "font_chinese": "Microsoft YaHei",
+        "font_english": "Arial",
+        "jpeg_quality": 92,
+        "png_compress_level": 1
+    },
+    "gif": {
+        "delay": 500,
+        "repeat": 0,
+        "quality": 20,
+        "width": 400,
+        "height": 400,
+        "keep_ratio": True
+    },
+    "pdf": {
+        "quality": 95,
+        "page_size": "A4",
+        "orientation": "portrait",
+        "margin": 10,
+        "downscale": False
+    },
+    "paths": {
+        "last_folder": "",
+        "default_output_folder": ""
+    }
+})
+
+def _copy_defaults() -> Dict[str, Any]:
+    """返回默认配置的深拷贝"""
+    return copy.deepcopy(dict(_DEFAULT_CONFIG))
+
+# 必要的配置节及合法的PDF页面大小（校验时使用）
+_REQUIRED_SECTIONS = frozenset({'app', 'watermark', 'gif', 'pdf', 'paths'})
+_VALID_PAGE_SIZES = frozenset({'A4', 'A3', 'Letter', 'Legal'})
+
+# 配置校验规则（JSON Schema）
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "required": sorted(_REQUIRED_SECTIONS),
+    "properties": {
+        "watermark": {
+            "type": "object",
+            "required": ["font_size", "opacity"],
+            "properties": {
+                "font_size": {"type": "number", "exclusiveMinimum": 0},
+                "opacity": {"type": "number", "minimum": 0, "maximum": 100},
+                "jpeg_quality": {"type": "integer", "minimum": 1, "maximum": 100},
+                "png_compress_level": {"type": "integer", "minimum": 0, "maximum": 9}
+            }
+        },
+        "gif": {
+            "type": "object",
+            "required": ["delay"],
+            "properties": {
+                "delay": {"type": "number", "exclusiveMinimum": 0}
+            }
+        },
+        "pdf": {
+            "type": "object",
+            "required": ["page_size"],
+            "properties": {
+                "page_size": {"enum": sorted(_VALID_PAGE_SIZES)},
+                "downscale": {"type": "boolean"}
+            }
+        }
+    }
+}
+
+def _is_number(value: Any) -> bool:
+    """是否为数值（与JSON Schema一致，布尔值不算数值）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_integer(value: Any) -> bool:
+    """是否为整数（与JSON Schema一致，小数部分为0的浮点数也算整数）"""
+    return _is_number(value) and float(value).is_integer()
+
+# 模块加载时编译一次，之后的 validate_config 调用直接复用
+_VALIDATE = fastjsonschema.compile(_CONFIG_SCHEMA) if fastjsonschema is not None else None
 
 class ConfigManager:
     """配置管理器"""
 
     def __init__(self, config_file: str = "pic_tool_config.json"):
+        self.logger = logging.getLogger("ConfigManager")
+
+        # 配置默认以JSON存储；配置文件名以 .msgpack 结尾时改用MessagePack，
+        # 同名JSON文件仅作为迁移来源保留。未安装msgpack时仍使用JSON文件
+        self.legacy_config_file: Optional[str] = None
+        if config_file.endswith(_MSGPACK_SUFFIX):
+            json_file = os.path.splitext(config_file)[0] + '.json'
+            if msgpack is None:
+                self.logger.warning("未安装msgpack，配置仍以JSON存储")
+                config_file = json_file
+            else:
+                self.legacy_config_file = json_file
+
         self.config_file = config_file
         self.config = {}
-        self.logger = logging.getLogger("ConfigManager")
 
-        # 默认配置
-        self.default_config = {
-            "app": {
-                "theme": "default",
-                "language": "zh_CN",
-                "auto_save": True,
-                "remember_last_folder": True,
-                "output_folder_suffix": "_processed"
-            },
-            "watermark": {
-                "text": "MU Group Leo: +86 13819858718",
-                "font_size": 40,
-                "opacity": 80,
-                "color": [255, 255, 0],
-                "position": "中心",
-                "multi_size": True,
-                "high_contrast": True,
-                "font_chinese": "Microsoft YaHei",
-                "font_english": "Arial"
-            },
-            "gif": {
-                "delay": 500,
-                "repeat": 0,
-                "quality": 20,
-                "width": 400,
-                "height": 400,
-                "keep_ratio": True
-            },
-            "pdf": {
-                "quality": 95,
-                "page_size": "A4",
-                "orientation": "portrait",
-                "margin": 10
-            },
-            "paths": {
-                "last_folder": "",
-                "default_output_folder": ""
-            }
-        }
+        # 查询缓存：键路径拆分结果长期有效，取值结果在配置变更时清空
+        self._path_cache: Dict[str, Tuple[str, ...]] = {}
+        self._value_cache: Dict[str, Any] = {}
+
+        # 上次加载的配置文件状态 (路径, 修改时间ns, 大小)，用于跳过重复解析
+        self._load_stat: Optional[Tuple[str, int, int]] = None
+
+        # 默认配置（模块级只读常量，所有实例共享）
+        self.default_config = _DEFAULT_CONFIG
+
+    def _invalidate_cache(self):
+        """配置变更后清空取值缓存及加载状态"""
+        self._value_cache.clear()
+        self._load_stat = None
 
     def load_settings(self) -> bool:
-        """加载配置文件"""
+        """加载配置文件
+
+        若配置文件自上次加载后未发生变化（路径、修改时间、大小一致），
+        且期间配置未被修改或保存，则直接沿用当前配置，不再重新解析。
+        MessagePack配置文件不存在而旧版JSON配置存在时，自动迁移。
+        """
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
+            st = os.stat(self.config_file)
+        except OSError:
+            st = None
+
+        if st is None and self.legacy_config_file and os.path.exists(self.legacy_config_file):
+            return self._migrate_legacy_config()
+
+        if st is not None and (self.config_file, st.st_mtime_ns, st.st_size) == self._load_stat:
+            return True
+
+        self._invalidate_cache()
+        try:
+            if st is not None:
+                with open(self.config_file, 'rb') as f:
+                    loaded_config = _decode_config(self.config_file, f.read())
 
                 # 合并配置（保留新增的默认配置项）
                 self.config = self.merge_configs(self.default_config, loaded_config)
+                self._load_stat = (self.config_file, st.st_mtime_ns, st.st_size)
                 self.logger.info(f"配置文件加载成功: {self.config_file}")
                 return True
             else:
                 # 使用默认配置
-                self.config = self.default_config.copy()
+                self.config = _copy_defaults()
                 self.logger.info("配置文件不存在，使用默认配置")
                 return False
 
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             self.logger.error(f"配置文件格式错误: {e}")
-            self.config = self.default_config.copy()
+            self.config = _copy_defaults()
             return False
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {e}")
-            self.config = self.default_config.copy()
+            self.config = _copy_defaults()
+            return False
+
+    def _migrate_legacy_config(self) -> bool:
+        """从旧版JSON配置迁移到MessagePack（JSON文件保留作为备份）"""
+        self._invalidate_cache()
+        try:
+            with open(self.legacy_config_file, 'rb') as f:
+                loaded_config = _json_loads(f.read())
+            self.config = self.merge_configs(self.default_config, loaded_config)
+        except Exception as e:
+            self.logger.error(f"加载旧版配置文件失败: {e}")
+            self.config = _copy_defaults()
             return False
 
+        self.logger.info(f"配置已迁移: {self.legacy_config_file} -> {self.config_file}")
+        self.save_settings()
+        return True
+
     def save_settings(self) -> bool:
         """保存配置文件"""
+        self._load_stat = None
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            _write_atomic(self.config_file, _encode_config(self.config_file, self.config))
             self.logger.info(f"配置文件保存成功: {self.config_file}")
             return True
         except Exception as e:
@@ -98,6 +284,45 @@ class ConfigManager:
     def get(self, key_path: str, default: Any = None) -> Any:
         """获取配置值
 
+        Args:
+            key_path: 配置键路径，如 'watermark.font_size'
+            default: 默认值
+
+        Returns:
+            配置值；字典、列表等容器返回副本，修改副本不影响当前配置
+        """
+        value = self._value_cache.get(key_path, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        keys = self._path_cache.get(key_path)
+        if keys is None:
+            keys = self._path_cache.setdefault(key_path, tuple(key_path.split('.')))
+
+        value = self.config
+        for key in keys:
+            if not isinstance(value, dict):
+                value = _MISSING
+                break
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                break
+
+        if value is _MISSING:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"配置项不存在: {key_path}，使用默认值: {default}")
+            return default
+
+        if isinstance(value, (dict, list)):
+            # 容器不缓存且返回副本：调用方修改返回值不会绕过缓存失效，造成配置与缓存不一致
+            return copy.deepcopy(value)
+
+        self._value_cache[key_path] = value
+        return value
+
+    def get_cached(self, key_path: str, default: Any = None) -> Any:
+        """获取配置值（热路径使用，命中缓存时直接返回）
+
         Args:
             key_path: 配置键路径，如 'watermark.font_size'
             default: 默认值
@@ -106,16 +331,46 @@ class ConfigManager:
             配置值
         """
         try:
-            keys = key_path.split('.')
-            value = self.config
+            return self._value_cache[key_path]
+        except KeyError:
+            return self.get(key_path, default)
 
-            for key in keys:
-                value = value[key]
+    def get_from_disk(self, key_path: str, default: Any = None) -> Any:
+        """直接从配置文件读取单个配置值（不加载、合并整个配置）
 
-            return value
-        except (KeyError, TypeError):
-            self.logger.warning(f"配置项不存在: {key_path}，使用默认值: {default}")
-            return default
+        适用于启动阶段只需要一两个配置项的场景。JSON配置文件在安装了ijson时
+        流式解析，找到目标键后立即停止读取；其余情况解析整个文件后取值。
+
+        Args:
+            key_path: 配置键路径，如 'watermark.font_size'
+            default: 默认值
+
+        Returns:
+            配置文件中的值，不存在时返回默认值
+        """
+        try:
+            with open(self.config_file, 'rb') as f:
+                if ijson is None or self.config_file.endswith(_MSGPACK_SUFFIX):
+                    value = _decode_config(self.config_file, f.read())
+                    for key in key_path.split('.'):
+                        if not isinstance(value, dict) or key not in value:
+                            return default
+                        value = value[key]
+                    return value
+
+                for prefix, event, value in ijson.parse(f, use_float=True):
+                    if prefix != key_path:
+                        continue
+                    if event in ('start_map', 'start_array'):
+                        # 容器值：从头按路径提取完整对象
+                        f.seek(0)
+                        return next(ijson.items(f, key_path, use_float=True), default)
+                    return value
+
+        except Exception as e:
+            self.logger.warning(f"从文件读取配置项失败: {key_path}, 错误: {e}")
+
+        return default
 
     def set(self, key_path: str, value: Any) -> bool:
         """设置配置值
@@ -127,6 +382,7 @@ class ConfigManager:
         Returns:
             是否设置成功
         """
+        self._invalidate_cache()
         try:
             keys = key_path.split('.')
             config = self.config
@@ -146,8 +402,19 @@ class ConfigManager:
             self.logger.error(f"设置配置项失败: {key_path} = {value}, 错误: {e}")
             return False
 
-    def get_section(self, section: str) -> Dict[str, Any]:
-        """获取配置节
+    def get_section(self, section: str) -> Mapping[str, Any]:
+        """获取配置节（只读视图，不复制）
+
+        Args:
+            section: 配置节名称，如 'watermark'
+
+        Returns:
+            配置节的只读映射，需要修改时请使用 get_section_mutable
+        """
+        return MappingProxyType(self.config.get(section, _EMPTY_DICT))
+
+    def get_section_mutable(self, section: str) -> Dict[str, Any]:
+        """获取配置节的副本（可自由修改，不影响当前配置）
 
         Args:
             section: 配置节名称，如 'watermark'
@@ -155,7 +422,7 @@ class ConfigManager:
         Returns:
             配置节字典
         """
-        return self.config.get(section, {}).copy()
+        return dict(self.config.get(section, _EMPTY_DICT))
 
     def update_section(self, section: str, values: Dict[str, Any]) -> bool:
         """更新配置节
@@ -167,11 +434,12 @@ class ConfigManager:
         Returns:
             是否更新成功
         """
-        try:
-            if section not in self.config:
-                self.config[section] = {}
+        if not values:
+            return True
 
-            self.config[section].update(values)
+        self._invalidate_cache()
+        try:
+            self.config.setdefault(section, {}).update(values)
             self.logger.info(f"配置节已更新: {section}")
             return True
 
@@ -188,16 +456,17 @@ class ConfigManager:
         Returns:
             是否重置成功
         """
+        self._invalidate_cache()
         try:
             if section:
                 if section in self.default_config:
-                    self.config[section] = self.default_config[section].copy()
+                    self.config[section] = copy.deepcopy(_DEFAULT_CONFIG[section])
                     self.logger.info(f"配置节已重置到默认值: {section}")
                 else:
                     self.logger.warning(f"未知的配置节: {section}")
                     return False
             else:
-                self.config = self.default_config.copy()
+                self.config = _copy_defaults()
                 self.logger.info("所有配置已重置到默认值")
 
             return True
@@ -207,22 +476,31 @@ class ConfigManager:
             return False
 
     def merge_configs(self, default: Dict, loaded: Dict) -> Dict:
-        """合并配置（递归合并，保留默认配置中的新项）"""
-        result = default.copy()
+        """合并配置（逐层合并，保留默认配置中的新项）
 
-        for key, value in loaded.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self.merge_configs(result[key], value)
-            else:
-                result[key] = value
+        先深拷贝一次默认配置，再用显式栈遍历嵌套字典原地合并，
+        避免递归调用和每层重复复制。
+        """
+        result = copy.deepcopy(dict(default))
+        stack = [(result, loaded)]
+
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                current = dst.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                else:
+                    dst[key] = value
 
         return result
 
     def export_settings(self, file_path: str) -> bool:
         """导出配置到文件"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            data = _json_dumps(self.config)
+            with open(file_path, 'wb') as f:
+                f.write(data)
             self.logger.info(f"配置已导出到: {file_path}")
             return True
         except Exception as e:
@@ -231,9 +509,10 @@ class ConfigManager:
 
     def import_settings(self, file_path: str) -> bool:
         """从文件导入配置"""
+        self._invalidate_cache()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                imported_config = json.load(f)
+            with open(file_path, 'rb') as f:
+                imported_config = _json_loads(f.read())
 
             # 合并导入的配置
             self.config = self.merge_configs(self.config, imported_config)
@@ -245,36 +524,66 @@ class ConfigManager:
 
     def validate_config(self) -> bool:
         """验证配置的有效性"""
+        if _VALIDATE is None:
+            return self._validate_config_manual()
+        return self._validate_config_schema()
+
+    def _validate_config_schema(self) -> bool:
+        """使用预编译的JSON Schema验证配置"""
+        try:
+            _VALIDATE(self.config)
+        except fastjsonschema.JsonSchemaException as e:
+            self.logger.error(f"配置验证失败: {e.message}")
+            return False
+
+        self.logger.info("配置验证通过")
+        return True
+
+    def _validate_config_manual(self) -> bool:
+        """逐项验证配置（未安装fastjsonschema时使用，检查项与 _CONFIG_SCHEMA 一致）"""
         try:
             # 验证必要的配置项
-            required_sections = ['app', 'watermark', 'gif', 'pdf', 'paths']
-            for section in required_sections:
-                if section not in self.config:
-                    self.logger.error(f"缺少必要的配置节: {section}")
-                    return False
+            if not _REQUIRED_SECTIONS <= self.config.keys():
+                missing = ', '.join(sorted(_REQUIRED_SECTIONS - self.config.keys()))
+                self.logger.error(f"缺少必要的配置节: {missing}")
+                return False
 
             # 验证水印配置
             watermark_config = self.config['watermark']
-            if not isinstance(watermark_config.get('font_size'), (int, float)) or watermark_config.get('font_size') <= 0:
+            if not _is_number(watermark_config.get('font_size')) or watermark_config.get('font_size') <= 0:
                 self.logger.error("水印字体大小配置无效")
                 return False
 
-            if not isinstance(watermark_config.get('opacity'), (int, float)) or not (0 <= watermark_config.get('opacity') <= 100):
+            if not _is_number(watermark_config.get('opacity')) or not (0 <= watermark_config.get('opacity') <= 100):
                 self.logger.error("水印透明度配置无效")
                 return False
 
+            jpeg_quality = watermark_config.get('jpeg_quality', 1)
+            if not _is_integer(jpeg_quality) or not (1 <= jpeg_quality <= 100):
+                self.logger.error("水印JPEG质量配置无效")
+                return False
+
+            png_compress_level = watermark_config.get('png_compress_level', 0)
+            if not _is_integer(png_compress_level) or not (0 <= png_compress_level <= 9):
+                self.logger.error("水印PNG压缩级别配置无效")
+                return False
+
             # 验证GIF配置
             gif_config = self.config['gif']
-            if not isinstance(gif_config.get('delay'), (int, float)) or gif_config.get('delay') <= 0:
+            if not _is_number(gif_config.get('delay')) or gif_config.get('delay') <= 0:
                 self.logger.error("GIF帧延迟配置无效")
                 return False
 
             # 验证PDF配置
             pdf_config = self.config['pdf']
-            if pdf_config.get('page_size') not in ['A4', 'A3', 'Letter', 'Legal']:
+            if pdf_config.get('page_size') not in _VALID_PAGE_SIZES:
                 self.logger.error("PDF页面大小配置无效")
                 return False
 
+            if not isinstance(pdf_config.get('downscale', False), bool):
+                self.logger.error("PDF缩小图片配置无效")
+                return False
+
             self.logger.info("配置验证通过")
             return True
 
@@ -8,26 +8,60 @@
 import os
 import sys
 import shutil
+import functools
 from pathlib import Path
 import platform
 
-def get_desktop_path():
-    """获取桌面路径"""
-    system = platform.system().lower()
+# 当前操作系统（小写），模块加载时获取一次
+_SYSTEM = platform.system().lower()
+
+# 已知文件夹ID：桌面（FOLDERID_Desktop）
+_FOLDERID_DESKTOP = "{B4BFCC3A-DB2C-424C-B029-7FE99A87C641}"
+
+def _get_windows_desktop_path():
+    """通过 SHGetKnownFolderPath 获取Windows桌面路径（支持重定向/OneDrive桌面）"""
+    import ctypes
+    import uuid
+
+    class GUID(ctypes.Structure):
+        _fields_ = [
+            ("Data1", ctypes.c_uint32),
+            ("Data2", ctypes.c_uint16),
+            ("Data3", ctypes.c_uint16),
+            ("Data4", ctypes.c_ubyte * 8),
+        ]
+
+    folder_id = uuid.UUID(_FOLDERID_DESKTOP)
+    guid = GUID(
+        folder_id.time_low,
+        folder_id.time_mid,
+        folder_id.time_hi_version,
+        (ctypes.c_ubyte * 8).from_buffer_copy(folder_id.bytes[8:])
+    )
+
+    path_ptr = ctypes.c_wchar_p()
+    result = ctypes.windll.shell32.SHGetKnownFolderPath(
+        ctypes.byref(guid), 0, None, ctypes.byref(path_ptr)
+    )
+    if result != 0:
+        raise OSError(f"SHGetKnownFolderPath 调用失败: {result:#x}")
+
+    try:
+        return path_ptr.value
+    finally:
+        # 返回的路径缓冲区由系统分配，需要释放
+        ctypes.windll.ole32.CoTaskMemFree(path_ptr)
 
-    if system == "windows":
-        import winreg
+@functools.lru_cache(maxsize=1)
+def get_desktop_path():
+    """获取桌面路径（结果缓存）"""
+    if _SYSTEM == "windows":
         try:
-            # 从注册表获取桌面路径
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                              r"Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders")
-            desktop_path = winreg.QueryValueEx(key, "Desktop")[0]
-            winreg.CloseKey(key)
-            return desktop_path
-        except:
+            return _get_windows_desktop_path()
+        except Exception:
             # 备用方案
             return os.path.join(os.path.expanduser("~"), "Desktop")
-    elif system == "darwin":  # macOS
+    elif _SYSTEM == "darwin":  # macOS
         return os.path.join(os.path.expanduser("~"), "Desktop")
     else:  # Linux
         return os.path.join(os.path.expanduser("~"), "Desktop")
@@ -92,12 +126,13 @@ def create_macos_launcher(target_path, launcher_path, working_dir=None):
 
     try:
         # 创建应用包结构
-        contents_dir = os.path.join(app_path, "Contents")
-        macos_dir = os.path.join(contents_dir, "MacOS")
-        resources_dir = os.path.join(contents_dir, "Resources")
+        contents_dir = Path(app_path, "Contents")
+        macos_dir = contents_dir / "MacOS"
+        resources_dir = contents_dir / "Resources"
 
-        os.makedirs(macos_dir, exist_ok=True)
-        os.makedirs(resources_dir, exist_ok=True)
+        # parents=True 会顺带创建 app 与 Contents 目录
+        macos_dir.mkdir(parents=True, exist_ok=True)
+        resources_dir.mkdir(exist_ok=True)
 
         # 创建Info.plist
         info_plist = f'''<?xml version="1.0" encoding="UTF-8"?>
@@ -120,20 +155,19 @@ def create_macos_launcher(target_path, launcher_path, working_dir=None):
     <true/>
 </dict>
 </plist>
-'''
-
-        with open(os.path.join(contents_dir, "Info.plist"), 'w', encoding='utf-8') as f:
-            f.write(info_plist)
+'''.encode('utf-8')
 
         # 创建启动脚本
         launcher_script = f'''#!/bin/bash
 cd "{working_dir or os.path.dirname(target_path)}"
 "{sys.executable}" "{target_path}"
-'''
+'''.encode('utf-8')
 
-        with open(os.path.join(macos_dir, "launcher.sh"), 'w', encoding='utf-8') as f:
-            f.write(launcher_script)
-        os.chmod(os.path.join(macos_dir, "launcher.sh"), 0o755)
+        # 内容预先编码，每个文件一次性写入
+        (contents_dir / "Info.plist").write_bytes(info_plist)
+        launcher_file = macos_dir / "launcher.sh"
+        launcher_file.write_bytes(launcher_script)
+        launcher_file.chmod(0o755)
 
         return True
     except:
@@ -160,10 +194,9 @@ def main():
     # 获取桌面路径
     desktop_path = get_desktop_path()
 
-    system = platform.system().lower()
     success = False
 
-    if system == "windows":
+    if _SYSTEM == "windows":
         # Windows快捷方式
         shortcut_name = "图片处理工具套件.lnk"
         shortcut_path = os.path.join(desktop_path, shortcut_name)
@@ -200,7 +233,7 @@ if errorlevel 1 (
             print(f"[OK] Windows批处理快捷方式已创建: {bat_path}")
             success = True
 
-    elif system == "darwin":  # macOS
+    elif _SYSTEM == "darwin":  # macOS
         launcher_name = "图片处理工具套件.desktop"
         launcher_path = os.path.join(desktop_path, launcher_name)
 
@@ -4,8 +4,24 @@
 模块包初始化文件
 """
 
-from .gif_converter import GifConverter
-from .pdf_converter import PdfConverter
-from .watermark_tool import WatermarkTool
+import importlib
 
-__all__ = ['GifConverter', 'PdfConverter', 'WatermarkTool']
\ No newline at end of file
+# 延迟导入：名称 -> 子模块，首次访问时才加载（PEP 562）
+_LAZY_IMPORTS = {
+    'GifConverter': '.gif_converter',
+    'PdfConverter': '.pdf_converter',
+    'WatermarkTool': '.watermark_tool',
+}
+
+__all__ = ['GifConverter', 'PdfConverter', 'WatermarkTool']
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -5,26 +5,70 @@ GIF转换器模块
 基于原始pic2gif项目重构，支持多图片转GIF动画
 """
 
+import io
 import os
 import sys
 import time
 import threading
 import queue
+import shutil
+import struct
 import logging
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageTk, ImageDraw, ImageFile, ImageChops
 from typing import List, Optional, Callable, Dict, Any
 
 from utils import (
-    get_image_files, is_image_file, format_file_size,
+    get_image_files, get_image_files_info, is_image_file, format_file_size,
     create_output_folder, safe_filename, handle_exception
 )
+from .thumb_cache import get_thumbnail
 
-class SimpleGifEncoder:
-    """简化的GIF编码器，基于原始项目的编码逻辑"""
+# 构建全局调色板时最多采样的帧数
+_PALETTE_SAMPLE_FRAMES = 16
+
+# 帧中与全局调色板颜色相差超过此值（任一通道）的像素超过 _PALETTE_MISS_RATIO 时，
+# 认为该帧含有全局调色板缺少的颜色，改用该帧自己的局部颜色表
+_PALETTE_MISS_ERROR = 48
+_PALETTE_MISS_RATIO = 0.01
+# 检查时每隔多少像素（行、列）抽取一个像素比较，抽样比例不影响缺色像素占比的估计
+_PALETTE_CHECK_STEP = 4
+
+# 构建全局调色板时最多统计的像素数（超出时对采样帧按最近邻抽取像素）
+_PALETTE_SAMPLE_PIXELS = 1 << 20
+
+# gifsicle 可执行文件路径（未安装时为None）
+_GIFSICLE = shutil.which('gifsicle')
 
-    def __init__(self):
+# 大幅缩小时先按整数倍快速缩减，再做Lanczos重采样（不小于3时画质与直接重采样几乎无差别）
+_REDUCING_GAP = 3.0
+
+# 后台生成预览缩略图的线程数
+_THUMB_WORKERS = 8
+
+class SimpleGifEncoder:
+    """简化的GIF编码器，基于原始项目的编码逻辑
+
+    帧以RGB形式缓存，编码时从采样帧一次性计算全局调色板，各帧共用同一颜色表；
+    也可通过 begin/add_frame_streaming/finalize 流式写出，不在内存中保留全部帧。
+    个别帧含有全局调色板缺少的颜色时（采样未覆盖到），该帧改用局部颜色表。
+
+    写出方式（backend）：
+        'direct'   直接写出GIF的定长数据块，帧数据交给Pillow的C语言LZW编码器
+        'pillow'   使用Pillow的 save_all 写出
+        'gifsicle' 直接写出后再由gifsicle做帧间差异与透明优化（需安装gifsicle）
+        'auto'     安装了gifsicle时使用'gifsicle'，否则使用'direct'
+    """
+
+    def __init__(self, backend: str = 'auto'):
+        if backend == 'auto':
+            backend = 'gifsicle' if _GIFSICLE else 'direct'
+        self.backend = backend
         self.width = 0
         self.height = 0
         self.delay = 500
@@ -33,6 +77,18 @@ class SimpleGifEncoder:
         self.frames = []
         self.global_palette = None
 
+        # 流式写出状态（begin/add_frame_streaming/finalize）
+        self._stream = None
+        self._out = None
+        self._tmp_dir = None
+        self._pending = []
+        self._header_written = False
+        self._frame_header = None
+        self._tile = None
+        self._palette_bits = 8
+        # 全局调色板是否由全部帧计算得到（此时各帧无需再检查缺色）
+        self._palette_covers_all = False
+
     def setSize(self, width: int, height: int):
         """设置GIF尺寸"""
         self.width = width
@@ -50,36 +106,323 @@ class SimpleGifEncoder:
         """设置图片质量"""
         self.quality = quality
 
-    def addFrame(self, image: Image.Image):
-        """添加一帧"""
+    def _normalize_frame(self, image: Image.Image) -> Image.Image:
+        """统一帧尺寸与模式（RGB）"""
         if image.size != (self.width, self.height):
-            image = image.resize((self.width, self.height), Image.Resampling.LANCZOS)
+            image = image.resize((self.width, self.height), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
+
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
 
-        if image.mode != 'P':
-            image = image.convert('P', palette=Image.Palette.ADAPTIVE, colors=256)
+        return image
+
+    def addFrame(self, image: Image.Image):
+        """添加一帧（缓存RGB数据，encode 时统一量化到全局调色板）"""
+        self.frames.append(self._normalize_frame(image))
+        self.global_palette = None
 
-        self.frames.append(image)
+    def _build_global_palette(self, frames: List[Image.Image]) -> Image.Image:
+        """将采样帧纵向拼接后做一次自适应量化，得到全局调色板"""
+        step = max(1, len(frames) // _PALETTE_SAMPLE_FRAMES)
+        samples = frames[::step][:_PALETTE_SAMPLE_FRAMES]
 
-    def encode(self) -> bytes:
-        """编码GIF数据"""
+        # 中值切分的耗时与像素数成正比；像素过多时隔行隔列抽取，
+        # 最近邻不产生新颜色，颜色分布基本不变
+        width, height = self.width, self.height
+        scale = (_PALETTE_SAMPLE_PIXELS / (width * height * len(samples))) ** 0.5
+        if scale < 1:
+            width, height = max(1, int(width * scale)), max(1, int(height * scale))
+            samples = [frame.resize((width, height), Image.Resampling.NEAREST) for frame in samples]
+
+        mosaic = Image.new('RGB', (width, height * len(samples)))
+        for i, frame in enumerate(samples):
+            mosaic.paste(frame, (0, i * height))
+
+        return mosaic.convert('P', palette=Image.Palette.ADAPTIVE, colors=256)
+
+    def _quantize(self, frame: Image.Image) -> Image.Image:
+        """将帧映射到全局调色板
+
+        不抖动时Pillow按颜色缓存表在C层查找最近的调色板颜色，
+        同一全局调色板下每种颜色只计算一次。
+        """
+        return frame.quantize(palette=self.global_palette, dither=Image.Dither.NONE)
+
+    def encode(self, out_stream):
+        """编码已添加的所有帧并直接写入输出流（如以'wb'打开的文件）"""
         if not self.frames:
             raise ValueError("没有帧数据")
 
-        # 使用内存流代替临时文件
-        import io
-        with io.BytesIO() as output:
-            self.frames[0].save(
-                output,
+        if self.global_palette is None:
+            self.global_palette = self._build_global_palette(self.frames)
+
+        if self.backend == 'pillow':
+            frames = [self._quantize(frame) for frame in self.frames]
+            frames[0].save(
+                out_stream,
                 format='GIF',
                 save_all=True,
-                append_images=self.frames[1:],
+                append_images=frames[1:],
                 duration=self.delay,
                 loop=self.repeat if self.repeat != 0 else 0,
-                optimize=True,
+                optimize=False,  # 已使用全局调色板，无需逐帧优化
                 quality=self.quality
             )
+            return
+
+        self.begin(out_stream)
+        self._palette_covers_all = len(self.frames) <= _PALETTE_SAMPLE_FRAMES
+        for frame in self.frames:
+            self._write_frame(frame)
+        self.finalize()
+
+    def encode_to_bytes(self) -> bytes:
+        """编码GIF数据并以字节串返回
+
+        仅用于需要内存中数据的场景；写文件请直接 encode(文件对象)，不经过中间缓冲区。
+        """
+        with io.BytesIO() as output:
+            self.encode(output)
             return output.getvalue()
 
+    def begin(self, out_stream, palette_frames: Optional[List[Image.Image]] = None):
+        """开始流式写出
+
+        之后逐帧调用 add_frame_streaming，最后调用 finalize 写入结束符。
+
+        Args:
+            out_stream: 输出流
+            palette_frames: 用于计算全局调色板的采样帧（应在全部帧中均匀抽取）；
+                未提供时先缓存前 _PALETTE_SAMPLE_FRAMES 帧计算调色板，
+                之后的帧量化后立即写出，不在内存中保留
+        """
+        if self.backend == 'pillow':
+            raise ValueError("pillow 写出方式不支持流式写出")
+
+        if palette_frames:
+            self.global_palette = self._build_global_palette(
+                [self._normalize_frame(frame) for frame in palette_frames]
+            )
+
+        self._stream = out_stream
+        self._pending = []
+        self._header_written = False
+        self._palette_covers_all = False
+
+        if self.backend == 'gifsicle':
+            # 先写入临时文件，finalize 时交给gifsicle优化后再复制到输出流
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix='pictool_gif_')
+            self._out = open(os.path.join(self._tmp_dir.name, 'raw.gif'), 'wb')
+        else:
+            self._out = out_stream
+
+        if self.global_palette is not None:
+            self._write_header()
+
+    def add_frame_streaming(self, image: Image.Image):
+        """流式添加一帧（调色板确定后立即编码写出）"""
+        image = self._normalize_frame(image)
+
+        if not self._header_written:
+            self._pending.append(image)
+            if len(self._pending) >= _PALETTE_SAMPLE_FRAMES:
+                self._flush_pending()
+            return
+
+        self._write_frame(image)
+
+    def finalize(self):
+        """写入GIF结束符，完成流式写出"""
+        try:
+            if not self._header_written:
+                if not self._pending:
+                    raise ValueError("没有帧数据")
+                # 全部帧都在缓存中，调色板由全部帧计算
+                self._flush_pending(covers_all=True)
+
+            self._out.write(b';')  # GIF结束符
+
+            if self._tmp_dir is not None:
+                self._out.close()
+                self._optimize_with_gifsicle(self._out.name, self._stream)
+        finally:
+            self._release()
+
+    def abort(self):
+        """放弃流式写出（取消或出错时调用），关闭并删除临时文件；输出流由调用方关闭"""
+        self._release()
+
+    def _release(self):
+        """释放流式写出占用的临时文件与缓存帧"""
+        if self._tmp_dir is not None:
+            if self._out is not None:
+                self._out.close()
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+        self._out = self._stream = None
+        self._pending = []
+
+    def _flush_pending(self, covers_all: bool = False):
+        """用已缓存的帧计算全局调色板，写出文件头及这些帧"""
+        self.global_palette = self._build_global_palette(self._pending)
+        self._palette_covers_all = covers_all
+        self._write_header()
+
+        for frame in self._pending:
+            self._write_frame(frame)
+        self._pending = []
+
+    def _write_header(self):
+        """写出文件头，并准备每帧共用的数据块"""
+        # 颜色表长度取不小于实际颜色数的2的幂（2~256）
+        colors = max(len(self.global_palette.getpalette('RGB')) // 3, 2)
+        self._palette_bits = (colors - 1).bit_length()
+
+        self._out.write(self._header_block())
+        self._frame_header = self._frame_header_block()
+        self._tile = [('gif', (0, 0, self.width, self.height), 0, 'P')]
+        self._header_written = True
+
+    def _write_frame(self, frame: Image.Image):
+        """量化并写出一帧"""
+        indexed = self._quantize(frame)
+
+        if not self._palette_covers_all and self._palette_misses(frame, indexed):
+            # 全局调色板缺少该帧的颜色，为该帧单独量化并写出局部颜色表
+            indexed = frame.convert('P', palette=Image.Palette.ADAPTIVE, colors=256)
+            palette = indexed.getpalette('RGB')
+            bits = (max(len(palette) // 3, 2) - 1).bit_length()
+            self._out.write(self._frame_header_block(bits, palette))
+        else:
+            # 共用全局颜色表，每帧相同的数据块只生成一次
+            bits = self._palette_bits
+            self._out.write(self._frame_header)
+
+        # ImageFile._save 让C编码器直接读取图像内存、经文件描述符写出，
+        # 不产生 tobytes 副本；改为手动 encode() 循环反而多一次字节串拷贝
+        # LZW码长与颜色表一致，颜色少时每个像素占用更少的位
+        indexed.encoderconfig = (self._lzw_min_code_size(bits), False)
+        ImageFile._save(indexed, self._out, list(self._tile))
+        self._out.write(b'\0')  # 图像数据结束
+
+    def _palette_misses(self, frame: Image.Image, indexed: Image.Image) -> bool:
+        """判断帧中是否有较多像素的颜色在全局调色板中找不到相近的颜色
+
+        原图与量化结果按最近邻抽取相同位置的像素后再比较，
+        耗时约为整帧比较的十分之一，远小于量化本身。
+        """
+        size = (max(1, frame.width // _PALETTE_CHECK_STEP), max(1, frame.height // _PALETTE_CHECK_STEP))
+        sample = frame.resize(size, Image.Resampling.NEAREST)
+        quantized = indexed.resize(size, Image.Resampling.NEAREST).convert('RGB')
+
+        # 各像素三个通道中的最大误差
+        r, g, b = ImageChops.difference(sample, quantized).split()
+        error = ImageChops.lighter(ImageChops.lighter(r, g), b)
+        misses = sum(error.histogram()[_PALETTE_MISS_ERROR:])
+        return misses > size[0] * size[1] * _PALETTE_MISS_RATIO
+
+    def _header_block(self) -> bytes:
+        """GIF文件头：签名、逻辑屏幕描述符、全局颜色表、NETSCAPE循环扩展"""
+        bits = self._palette_bits
+        # 颜色表长度必须为2的幂，不足部分补零
+        palette = bytes(self.global_palette.getpalette('RGB')).ljust(3 * (1 << bits), b'\0')
+
+        return (
+            b'GIF89a'
+            + struct.pack('<HHBBB', self.width, self.height, 0x80 | (bits - 1), 0, 0)
+            + palette
+            + b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', self.repeat) + b'\0'
+        )
+
+    def _frame_header_block(self, bits: Optional[int] = None, palette: Optional[List[int]] = None) -> bytes:
+        """图形控制扩展（帧延迟）与图像描述符，以及LZW最小码长
+
+        Args:
+            bits: 局部颜色表的位数（未提供时使用全局颜色表）
+            palette: 局部颜色表（RGB平铺列表）
+        """
+        if palette is None:
+            bits, flags, color_table = self._palette_bits, 0, b''
+        else:
+            flags = 0x80 | (bits - 1)
+            color_table = bytes(palette).ljust(3 * (1 << bits), b'\0')
+
+        return (
+            b'!\xf9\x04\0' + struct.pack('<H', self.delay // 10) + b'\0\0'
+            + b',' + struct.pack('<HHHHB', 0, 0, self.width, self.height, flags)
+            + color_table
+            + bytes([self._lzw_min_code_size(bits)])
+        )
+
+    def _lzw_min_code_size(self, bits: Optional[int] = None) -> int:
+        """LZW最小码长（与颜色表位数一致，GIF规范要求不小于2）"""
+        return max(self._palette_bits if bits is None else bits, 2)
+
+    def _optimize_with_gifsicle(self, raw_path: str, out_stream):
+        """由gifsicle优化已写出的GIF文件，并复制到输出流"""
+        optimized_path = os.path.join(os.path.dirname(raw_path), 'optimized.gif')
+
+        try:
+            subprocess.run(
+                [_GIFSICLE or 'gifsicle', '--optimize=3', raw_path, '--output', optimized_path],
+                check=True,
+                capture_output=True,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            # gifsicle不可用或失败时使用未优化的结果
+            logging.getLogger("SimpleGifEncoder").warning(f"gifsicle优化失败，使用未优化的GIF: {e}")
+            optimized_path = raw_path
+
+        with open(optimized_path, 'rb') as f:
+            shutil.copyfileobj(f, out_stream)
+
+def _palette_sample_indices(total: int) -> List[int]:
+    """在全部帧中均匀抽取用于计算全局调色板的帧序号（含首尾两帧）"""
+    count = min(total, _PALETTE_SAMPLE_FRAMES)
+    if count <= 1:
+        return list(range(count))
+    return sorted({i * (total - 1) // (count - 1) for i in range(count)})
+
+def _letterbox(image: Image.Image, width: int, height: int) -> Image.Image:
+    """将图片居中放到目标尺寸的白底画布上
+
+    画布在C层一次填充并贴图；结果需跨进程返回，每帧本就要新建一份像素数据，
+    复用画布缓冲并不能减少分配。
+    """
+    canvas = Image.new('RGB', (width, height), (255, 255, 255))
+    x = (width - image.width) // 2
+    y = (height - image.height) // 2
+    canvas.paste(image, (x, y))
+    return canvas
+
+def _prepare_frame(image_path: str, width: int, height: int, keep_ratio: bool) -> Image.Image:
+    """加载并处理单帧图片（在进程池中执行）
+
+    完成缩放和居中铺白底，返回RGB图片；调色板量化由编码器统一完成。
+    """
+    image = Image.open(image_path)
+
+    # JPEG在DCT域预缩小，避免完整解码大图（其他格式无影响）
+    image.draft('RGB', (int(width * _REDUCING_GAP), int(height * _REDUCING_GAP)))
+
+    # 'P'/'1'等模式下Pillow的resize会退化为最近邻，先统一为RGB（灰度图直接缩放，贴到画布时再转换）
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    # 调整尺寸
+    if keep_ratio:
+        # 保持宽高比
+        image.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
+        # 宽高比与目标一致时缩放结果已铺满，无需画布
+        if image.size != (width, height):
+            image = _letterbox(image, width, height)
+    else:
+        # 强制调整尺寸
+        image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
+
+    return image if image.mode == 'RGB' else image.convert('RGB')
+
 class GifConverter:
     """GIF转换器主类"""
 
@@ -94,29 +437,47 @@ class GifConverter:
 
         # 状态变量
         self.image_files = []
+        self.image_files_info = []  # (路径, 大小, 修改时间)，加载文件夹时一次获取
         self.current_folder = tk.StringVar()
         self.selected_images = tk.StringVar()
         self.is_processing = False
         self.stop_requested = False
 
+        # 缩略图后台加载：每次刷新预览递增批次号，丢弃过期结果
+        self._thumb_executor = ThreadPoolExecutor(max_workers=_THUMB_WORKERS)
+        self._thumb_generation = 0
+        self._thumb_slots = []
+
         # GIF参数变量
         self.delay_var = tk.IntVar(value=500)
         self.repeat_var = tk.IntVar(value=0)
         self.quality_var = tk.IntVar(value=20)
         
-        # 验证回调
-        def validate_inputs(*args):
+        # 验证回调：连续写入（输入、拖动滑块、加载设置）合并为50ms后的一次校验
+        self._validate_pending = False
+
+        def validate_inputs():
             try:
                 # 延迟不能过小
                 if self.delay_var.get() < 10: self.delay_var.set(10)
                 # 质量限制
-                if self.quality_var.get() < 1: self.quality_var.set(1)
-                if self.quality_var.get() > 100: self.quality_var.set(100)
+                quality = self.quality_var.get()
+                if quality < 1: self.quality_var.set(1)
+                if quality > 100: self.quality_var.set(100)
             except:
                 pass
+            finally:
+                # 校验中的 set() 触发的回调在此之前被忽略，不会重复校验
+                self._validate_pending = False
+
+        def schedule_validate(*args):
+            if self._validate_pending:
+                return
+            self._validate_pending = True
+            self.parent_frame.after(50, validate_inputs)
         
-        self.delay_var.trace_add('write', validate_inputs)
-        self.quality_var.trace_add('write', validate_inputs)
+        self.delay_var.trace_add('write', schedule_validate)
+        self.quality_var.trace_add('write', schedule_validate)
         self.width_var = tk.IntVar(value=400)
         self.height_var = tk.IntVar(value=400)
         self.keep_ratio_var = tk.BooleanVar(value=True)
@@ -324,7 +685,13 @@ class GifConverter:
         if not folder_path or not os.path.isdir(folder_path):
             return
 
-        self.image_files = get_image_files(folder_path)
+        self.image_files_info = get_image_files_info(folder_path)
+        self.image_files = [info[0] for info in self.image_files_info]
+
+        # 图片列表已替换：取消旧列表尚未开始的缩略图任务，换用新线程池
+        self._thumb_executor.shutdown(wait=False, cancel_futures=True)
+        self._thumb_executor = ThreadPoolExecutor(max_workers=_THUMB_WORKERS)
+
         self.update_preview()
         self.update_file_info()
 
@@ -335,62 +702,92 @@ class GifConverter:
             })
 
     def update_preview(self):
-        """更新预览区域"""
+        """更新预览区域（先显示占位项，缩略图在后台线程生成）"""
         # 清空现有预览
         for widget in self.preview_content.winfo_children():
             widget.destroy()
 
+        self._thumb_generation += 1
+        self._thumb_slots = []
+
         if not self.image_files:
             ttk.Label(self.preview_content, text="请选择包含图片的文件夹").pack()
             return
 
         # 显示图片缩略图
-        for i, image_path in enumerate(self.image_files):
-            self.create_image_thumbnail(image_path, i)
+        generation = self._thumb_generation
+        for i, (image_path, file_size, mtime) in enumerate(self.image_files_info):
+            self._thumb_slots.append(self.create_image_thumbnail(image_path, i))
+            self._thumb_executor.submit(
+                self._load_thumbnail, generation, i, image_path, file_size, mtime
+            )
 
     def create_image_thumbnail(self, image_path: str, index: int):
-        """创建图片缩略图"""
+        """创建图片缩略图占位项，返回 (图片标签, 信息框架)"""
         frame = ttk.Frame(self.preview_content)
         frame.pack(pady=5, padx=5, anchor='w')
 
-        try:
-            # 加载并调整图片大小
-            image = Image.open(image_path)
-            image.thumbnail((100, 100), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-
-            # 图片标签
-            img_label = ttk.Label(frame, image=photo)
-            img_label.image = photo  # 保持引用
-            img_label.pack(side='left', padx=(0, 5))
+        # 图片标签（缩略图加载完成后替换）
+        img_label = ttk.Label(frame, text="加载中...")
+        img_label.pack(side='left', padx=(0, 5))
 
-            # 文件信息
-            info_frame = ttk.Frame(frame)
-            info_frame.pack(side='left', fill='x', expand=True)
+        # 文件信息
+        info_frame = ttk.Frame(frame)
+        info_frame.pack(side='left', fill='x', expand=True)
 
-            # 文件名
-            filename = os.path.basename(image_path)
-            if len(filename) > 30:
-                filename = filename[:27] + "..."
-            ttk.Label(info_frame, text=filename, font=('Arial', 9, 'bold')).pack(anchor='w')
+        # 文件名
+        filename = os.path.basename(image_path)
+        if len(filename) > 30:
+            filename = filename[:27] + "..."
+        ttk.Label(info_frame, text=filename, font=('Arial', 9, 'bold')).pack(anchor='w')
 
-            # 文件大小
-            file_size = format_file_size(os.path.getsize(image_path))
-            ttk.Label(info_frame, text=file_size, font=('Arial', 8), foreground='gray').pack(anchor='w')
+        return img_label, info_frame
 
-            # 图片尺寸
-            img_size = f"{image.width}×{image.height}"
-            ttk.Label(info_frame, text=img_size, font=('Arial', 8), foreground='gray').pack(anchor='w')
+    def _load_thumbnail(self, generation: int, index: int, image_path: str,
+                        file_size: int, mtime: float):
+        """后台生成缩略图，通过消息队列交回主线程显示"""
+        if generation != self._thumb_generation:
+            return
 
+        try:
+            image = get_thumbnail(image_path, mtime=mtime)
+            file_size = format_file_size(file_size)
         except Exception as e:
             self.logger.error(f"创建缩略图失败 {image_path}: {e}")
-            ttk.Label(frame, text="加载失败", foreground='red').pack(side='left')
+            image, file_size = None, None
+
+        self.message_queue.put({
+            'type': 'thumb_ready',
+            'data': {'generation': generation, 'index': index, 'image': image, 'file_size': file_size}
+        })
+
+    def on_thumbnail_ready(self, data: Dict[str, Any]):
+        """在主线程中显示后台生成的缩略图"""
+        if data['generation'] != self._thumb_generation:
+            return
+
+        img_label, info_frame = self._thumb_slots[data['index']]
+        image = data['image']
+        if image is None:
+            img_label.config(text="加载失败", foreground='red')
+            return
+
+        photo = ImageTk.PhotoImage(image)
+        img_label.config(image=photo, text='')
+        img_label.image = photo  # 保持引用
+
+        # 文件大小
+        ttk.Label(info_frame, text=data['file_size'], font=('Arial', 8), foreground='gray').pack(anchor='w')
+
+        # 图片尺寸
+        img_size = f"{image.width}×{image.height}"
+        ttk.Label(info_frame, text=img_size, font=('Arial', 8), foreground='gray').pack(anchor='w')
 
     def update_file_info(self):
         """更新文件信息"""
         count = len(self.image_files)
         if count > 0:
-            total_size = sum(os.path.getsize(f) for f in self.image_files if os.path.exists(f))
+            total_size = sum(info[1] for info in self.image_files_info)
             size_text = format_file_size(total_size)
             self.file_count_label.config(text=f"找到 {count} 个图片文件 (总大小: {size_text})")
         else:
@@ -404,20 +801,21 @@ class GifConverter:
             return
 
         try:
-            # 加载第一张图片
-            image_path = self.image_files[0]
-            image = Image.open(image_path)
-
-            # 调整到目标尺寸
+            # 目标尺寸
             width = self.width_var.get()
             height = self.height_var.get()
 
+            # 加载第一张图片（JPEG在DCT域预缩小，避免完整解码大图）
+            image_path = self.image_files[0]
+            image = Image.open(image_path)
+            image.draft('RGB', (2 * width, 2 * height))
+
             if self.keep_ratio_var.get():
                 # 保持宽高比
-                image.thumbnail((width, height), Image.Resampling.LANCZOS)
+                image.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
             else:
                 # 强制调整尺寸
-                image = image.resize((width, height), Image.Resampling.LANCZOS)
+                image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
 
             # 显示预览窗口
             self.show_preview_window(image, os.path.basename(image_path))
@@ -507,67 +905,93 @@ class GifConverter:
             encoder.setRepeat(repeat)
             encoder.setQuality(quality)
 
-            # 处理每一张图片
+            # 多进程并行处理每一张图片，按原顺序取回结果；
+            # 处理好的帧流式写入文件，不在内存中保留全部帧
             total_images = len(self.image_files)
-            for i, image_path in enumerate(self.image_files):
-                if self.stop_requested:
-                    break
-
-                # Check memory periodically
-                if i % 5 == 0:
-                    if psutil.virtual_memory().available < 50 * 1024 * 1024:
-                        raise MemoryError("内存不足，处理被终止")
-
-                # 更新进度
-                progress = (i + 1) / total_images * 100
-                self.message_queue.put({
-                    'type': 'progress',
-                    'data': progress
-                })
-
-                self.message_queue.put({
-                    'type': 'status',
-                    'data': f"处理图片 {i+1}/{total_images}: {os.path.basename(image_path)}"
-                })
-
-                # 加载图片
-                try:
-                    image = Image.open(image_path)
-
-                    # 调整尺寸
-                    if keep_ratio:
-                        # 保持宽高比
-                        image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                        # 创建目标尺寸的画布
-                        canvas = Image.new('RGB', (width, height), (255, 255, 255))
-                        # 居中放置图片
-                        x = (width - image.width) // 2
-                        y = (height - image.height) // 2
-                        canvas.paste(image, (x, y))
-                        image = canvas
-                    else:
-                        # 强制调整尺寸
-                        image = image.resize((width, height), Image.Resampling.LANCZOS)
-
-                    # 添加到编码器
-                    encoder.addFrame(image)
-
-                except Exception as e:
-                    self.logger.error(f"处理图片失败 {image_path}: {e}")
-
-            if self.stop_requested:
+            max_workers = min(os.cpu_count() or 1, total_images)
+            # 在途任务上限：加载缩放与编码写出重叠进行，已完成未写出的帧不会无限堆积
+            window = max_workers * 2
+            completed = False
+            output_file = open(output_path, 'wb')
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    # 先处理在全部图片中均匀抽取的采样帧，据此计算全局调色板，
+                    # 后段才出现的颜色也能进入调色板；采样帧写出时直接复用，不重复处理
+                    sample_futures = {
+                        index: executor.submit(_prepare_frame, self.image_files[index], width, height, keep_ratio)
+                        for index in _palette_sample_indices(total_images)
+                    }
+                    palette_frames = []
+                    for future in sample_futures.values():
+                        try:
+                            palette_frames.append(future.result())
+                        except Exception:
+                            # 处理失败的图片在按顺序写出时记录错误
+                            pass
+
+                    encoder.begin(output_file, palette_frames=palette_frames)
+                    palette_frames = None
+
+                    pending = deque()
+                    image_iter = enumerate(self.image_files)
+
+                    for i in range(total_images):
+                        if self.stop_requested:
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            break
+
+                        # Check memory periodically
+                        if i % 5 == 0:
+                            if psutil.virtual_memory().available < 50 * 1024 * 1024:
+                                executor.shutdown(wait=False, cancel_futures=True)
+                                raise MemoryError("内存不足，处理被终止")
+
+                        # 补足在途任务，再按顺序取出下一帧
+                        while len(pending) < window:
+                            index, next_path = next(image_iter, (None, None))
+                            if next_path is None:
+                                break
+                            future = sample_futures.pop(index, None)
+                            if future is None:
+                                future = executor.submit(_prepare_frame, next_path, width, height, keep_ratio)
+                            pending.append((next_path, future))
+
+                        image_path, future = pending.popleft()
+
+                        # 更新进度（进度与状态合并为一条消息）
+                        progress = (i + 1) / total_images * 100
+                        self.message_queue.put({
+                            'type': 'tick',
+                            'data': (progress, f"处理图片 {i+1}/{total_images}: {os.path.basename(image_path)}")
+                        })
+
+                        # 取回处理结果并写入编码器
+                        try:
+                            frame = future.result()
+                        except Exception as e:
+                            self.logger.error(f"处理图片失败 {image_path}: {e}")
+                            continue
+
+                        encoder.add_frame_streaming(frame)
+
+                if not self.stop_requested:
+                    encoder.finalize()
+                    completed = True
+            finally:
+                if not completed:
+                    # 未执行 finalize：释放编码器的临时文件（gifsicle写出方式）
+                    encoder.abort()
+                output_file.close()
+                # 取消或失败时删除不完整的文件
+                if not completed:
+                    os.remove(output_path)
+
+            if not completed:
                 self.message_queue.put({
                     'type': 'status',
                     'data': "生成已取消"
                 })
             else:
-                # 生成GIF
-                gif_data = encoder.encode()
-
-                # 保存文件
-                with open(output_path, 'wb') as f:
-                    f.write(gif_data)
-
                 # 完成
                 self.message_queue.put({
                     'type': 'status',
@@ -645,6 +1069,11 @@ class GifConverter:
         except Exception as e:
             self.logger.error(f"加载设置失败: {e}")
 
+    def close(self):
+        """关闭工具：取消尚未开始的缩略图任务并释放线程池"""
+        self._thumb_generation += 1
+        self._thumb_executor.shutdown(wait=False, cancel_futures=True)
+
     def save_settings(self):
         """保存设置"""
         try:
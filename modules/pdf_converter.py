@@ -6,16 +6,20 @@ PDF转换器模块
 """
 
 import os
+import itertools
 import sys
 import time
 import threading
 import queue
 import logging
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
 from datetime import datetime
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, Tuple
 
 try:
     import img2pdf
@@ -23,10 +27,140 @@ except ImportError:
     img2pdf = None
 
 from utils import (
-    get_image_files, is_image_file, format_file_size,
+    get_image_files_info, is_image_file, format_file_size,
     create_output_folder, safe_filename, handle_exception,
-    get_exif_datetime
+    get_exif_datetime, get_image_size
 )
+from .pdf_writer import read_jpeg_page, write_jpeg_pdf
+
+# 后台加载图片信息时，界面更新的批大小与最长间隔（秒）
+_DETAILS_BATCH_SIZE = 50
+_DETAILS_BATCH_INTERVAL = 0.05
+# 主线程取回后台加载结果的检查间隔（毫秒）
+_DETAILS_POLL_INTERVAL = 50
+
+# 图片列表每批插入的行数（首批同步插入，其余在主循环空闲时插入）
+_TREE_INSERT_CHUNK = 200
+
+# 各页面大小在300 DPI下的像素尺寸（纵向）
+_PAGE_PIXELS = {
+    'A4': (2480, 3508),
+    'A3': (3508, 4961),
+    'A5': (1748, 2480),
+    'Letter': (2550, 3300),
+    'Legal': (2550, 4200),
+}
+
+# img2pdf 对未记录DPI的图片按96 DPI确定页面尺寸
+_DEFAULT_DPI = 96
+
+# Exif方向值 -> 转正所需的变换（方向1或缺失时无需变换）
+_ORIENT_MAP = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+def _source_dpi(img: Image.Image) -> Tuple[int, int]:
+    """读取图片记录的DPI（与 read_jpeg_page 一样取整；未记录或无效时为96 DPI）"""
+    try:
+        dpi = tuple(int(round(value)) for value in img.info['dpi'])
+    except (KeyError, TypeError, ValueError):
+        return (_DEFAULT_DPI, _DEFAULT_DPI)
+    if len(dpi) != 2 or dpi[0] <= 0 or dpi[1] <= 0:
+        return (_DEFAULT_DPI, _DEFAULT_DPI)
+    return dpi
+
+def _encode_page(image_path: str, quality: int, page_path: str,
+                 max_size: Optional[Tuple[int, int]] = None) -> str:
+    """解码单张图片并重新编码为JPEG文件（在进程池中执行）
+
+    Args:
+        image_path: 图片路径
+        quality: JPEG质量
+        page_path: 重新编码后的临时文件路径
+        max_size: 最大像素尺寸（纵向，长边对长边比较），超出时等比缩小
+
+    Returns:
+        写入PDF的图片文件路径
+    """
+    with Image.open(image_path) as img:
+        orientation = img.getexif().get(0x0112, 1)
+
+        # 重新编码时沿用原图的DPI，页面物理尺寸与原文件直接嵌入时一致
+        source_dpi = _source_dpi(img)
+        dpi = source_dpi
+
+        # 超出页面分辨率的图片先缩小，减少JPEG编码量和输出体积；
+        # DPI同比降低，PDF页面的物理尺寸保持不变
+        target_size = None
+        if max_size is not None:
+            box = max_size if img.width <= img.height else (max_size[1], max_size[0])
+            scale = min(box[0] / img.width, box[1] / img.height)
+            if scale < 1:
+                dpi = (max(1, int(source_dpi[0] * scale)), max(1, int(source_dpi[1] * scale)))
+                target_size = (max(1, round(img.width * dpi[0] / source_dpi[0])),
+                               max(1, round(img.height * dpi[1] / source_dpi[1])))
+
+        # 不降低质量、不缩小且方向正常的JPEG由img2pdf无损嵌入原文件，无需解码重编码
+        # （Image.open 只解析文件头，此时尚未解码像素）
+        if quality >= 100 and target_size is None and img.format == 'JPEG' and orientation == 1:
+            return image_path
+
+        if target_size is not None:
+            # JPEG在DCT域预缩小，避免完整解码大图（其他格式无影响）
+            img.draft('RGB', target_size)
+
+        # 转换Exif方向（复用上面读到的方向值，方向正常时不做任何处理）
+        method = _ORIENT_MAP.get(orientation)
+        if method is not None:
+            raw_size = img.size
+            img = img.transpose(method)
+            if img.size != raw_size:
+                dpi = dpi[::-1]
+                if target_size is not None:
+                    target_size = target_size[::-1]
+
+        # 如果需要压缩（质量<100），则转换为JPEG
+        # 注意：如有透明通道需预处理；RGB图片（最常见的情况）无需任何转换
+        mode = img.mode
+        if mode == 'RGBA':
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            # RGBA图片本身作为蒙版时直接使用其alpha通道，无需 split() 拆出四个通道
+            background.paste(img, mask=img)
+            img = background
+        elif mode != 'RGB':
+            img = img.convert('RGB')
+
+        if target_size is not None:
+            img = img.resize(target_size, Image.Resampling.BILINEAR)
+
+        # 保存到临时文件（Pillow官方发行包的JPEG编码即为libjpeg-turbo）
+        img.save(page_path, format='JPEG', quality=quality, dpi=dpi)
+        return page_path
+
+def _write_pdf(page_files: List[str], output_path: str):
+    """由各页图片文件合成PDF并直接写入输出文件（在子进程中执行）
+
+    所有页面都是可直接嵌入的JPEG时逐页流式写出，内存占用与页数无关；
+    否则交由img2pdf处理（需要先读入全部页面）。
+    """
+    pages = [read_jpeg_page(path) for path in page_files]
+    try:
+        with open(output_path, "wb") as f:
+            if all(page is not None for page in pages):
+                write_jpeg_pdf(f, page_files, pages)
+            else:
+                img2pdf.convert(page_files, outputstream=f)
+    except Exception:
+        # 删除不完整的文件
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
 
 class PdfConverter:
     """PDF转换器主类"""
@@ -52,11 +186,35 @@ class PdfConverter:
         self.page_size_var = tk.StringVar(value="A4")
         self.orientation_var = tk.StringVar(value="portrait")
         self.margin_var = tk.IntVar(value=10)
+        # 是否将超出页面300 DPI分辨率的图片缩小（与图片质量相互独立）
+        self.downscale_var = tk.BooleanVar(value=False)
 
         # 选中项
         self.selected_index = -1
         self.selected_images = []
 
+        # 图片信息缓存：路径 -> (文件大小, 修改时间, 宽, 高)，调整顺序或删除时无需重新读取；
+        # 宽高为None表示尚未读取图片尺寸
+        self._meta = {}
+        # 每次重建列表递增批次号，丢弃过期的分批插入和信息加载结果
+        self._details_generation = 0
+        # 图片信息按插入顺序在单个后台线程中加载，靠前的行先显示
+        self._details_executor = ThreadPoolExecutor(max_workers=1)
+        # 后台线程只把结果放入队列，由主线程定时取出更新列表（Tk控件只能在主线程操作）
+        self._details_queue = queue.Queue()
+        # 尚未结束的加载任务数（仅在主线程读写），为0时停止检查队列
+        self._details_active = 0
+        # 已插入列表的行数（列表项按 image_files 顺序分批插入）
+        self._rows_inserted = 0
+
+        # 列表项ID与 image_files 一一对应且不随位置变化，移动/删除时只操作单个列表项
+        self._iids = []
+        self._iid_counter = itertools.count()
+
+        # 预览图LRU缓存：(路径, 修改时间, 画布宽, 画布高) -> PhotoImage，来回切换选中项时无需重新解码
+        self._preview_cache = OrderedDict()
+        self._preview_cache_max = 32
+
         self.setup_ui()
         self.load_settings()
 
@@ -163,6 +321,13 @@ class PdfConverter:
 
         quality_scale.config(command=lambda v: self.quality_label.config(text=f"{int(float(v))}%"))
 
+        # 按页面大小缩小图片
+        ttk.Checkbutton(
+            parent,
+            text="按页面大小缩小图片（300 DPI）",
+            variable=self.downscale_var
+        ).pack(anchor='w', pady=(10, 0))
+
     def create_file_selection_panel(self, parent):
         """创建文件选择面板"""
         # 文件夹选择
@@ -297,7 +462,15 @@ class PdfConverter:
         if not folder_path or not os.path.isdir(folder_path):
             return
 
-        self.image_files = get_image_files(folder_path)
+        # 扫描目录时一并取得文件大小和修改时间（每个文件只 stat 一次），
+        # 据此校验缓存，未变化的图片无需重新读取尺寸
+        files_info = get_image_files_info(folder_path)
+        for image_path, file_size, mtime in files_info:
+            meta = self._meta.get(image_path)
+            if meta is None or meta[1] != mtime:
+                self._meta[image_path] = (file_size, mtime, None, None)
+
+        self.image_files = [info[0] for info in files_info]
         self.update_image_list()
         self.update_file_info()
 
@@ -309,56 +482,142 @@ class PdfConverter:
 
     def update_image_list(self):
         """更新图片列表"""
-        # 清空现有项目
-        for item in self.image_tree.get_children():
-            self.image_tree.delete(item)
+        # 清空现有项目（一次调用删除全部行，而非逐行删除）
+        children = self.image_tree.get_children()
+        if children:
+            self.image_tree.delete(*children)
+
+        self._iids = [str(next(self._iid_counter)) for _ in self.image_files]
+        self._rows_inserted = 0
+        self._details_generation += 1
+        self._insert_rows(self._details_generation)
+
+    def _insert_rows(self, generation: int):
+        """插入下一批列表项，并在后台加载这批缺少的详细信息
+
+        大文件夹的列表分批插入，每批之间让出主循环，界面不会长时间无响应。
+        """
+        if generation != self._details_generation:
+            return
 
-        # 先添加文件名，尺寸显示"加载中..."
-        for i, image_path in enumerate(self.image_files):
+        start = self._rows_inserted
+        end = min(start + _TREE_INSERT_CHUNK, len(self.image_files))
+
+        # 先添加文件名，已缓存的直接显示尺寸和大小，其余显示"加载中..."
+        pending = []
+        for item_id, image_path in zip(self._iids[start:end], self.image_files[start:end]):
             filename = os.path.basename(image_path)
-            self.image_tree.insert('', 'end', iid=str(i), values=(filename, "加载中...", "加载中..."))
-
-        # 启动后台线程加载详细信息
-        threading.Thread(target=self._load_image_details_thread, daemon=True).start()
-
-    def _load_image_details_thread(self):
-        """后台加载图片详细信息"""
-        for i, image_path in enumerate(self.image_files):
-            try:
-                if not os.path.exists(image_path):
-                    continue
-
-                # 获取文件大小
-                file_size = format_file_size(os.path.getsize(image_path))
-                
-                # 获取图片尺寸（尽量不完全加载图片以节省内存）
-                with Image.open(image_path) as img:
-                     size_text = f"{img.width}×{img.height}"
-
-                # 更新界面（需在主线程执行）
-                self.parent_frame.after(0, self._update_tree_item, str(i), size_text, file_size)
-
-            except Exception as e:
-                self.logger.error(f"读取图片信息失败 {image_path}: {e}")
-                self.parent_frame.after(0, self._update_tree_item, str(i), "未知", "未知")
-    
-    def _update_tree_item(self, item_id, size_text, file_size):
-        """更新单个列表项"""
-        if self.image_tree.exists(item_id):
-            current_values = self.image_tree.item(item_id)['values']
-            if current_values:
-                 self.image_tree.item(item_id, values=(current_values[0], size_text, file_size))
+            meta = self._meta.get(image_path)
+            if meta is None or meta[2] is None:
+                values = (filename, "加载中...", "加载中...")
+                pending.append((item_id, image_path))
+            else:
+                values = (filename, f"{meta[2]}×{meta[3]}", format_file_size(meta[0]))
+            self.image_tree.insert('', 'end', iid=item_id, values=values)
+        self._rows_inserted = end
+
+        if pending:
+            self._details_active += 1
+            self._details_executor.submit(self._load_image_details_thread, generation, pending)
+            if self._details_active == 1:
+                self.parent_frame.after(_DETAILS_POLL_INTERVAL, self._drain_details)
+
+        if end < len(self.image_files):
+            self.parent_frame.after_idle(self._insert_rows, generation)
+
+    def _load_image_details_thread(self, generation: int, items: List[tuple]):
+        """后台加载图片详细信息
+
+        Args:
+            generation: 启动时的批次号，列表已重建时停止加载
+            items: (列表项ID, 图片路径) 列表
+        """
+        # 界面更新按批提交（每50项或每50毫秒），避免每个文件各唤醒一次主循环
+        batch = []
+        last_flush = time.monotonic()
+
+        try:
+            for item_id, image_path in items:
+                if generation != self._details_generation:
+                    return
+
+                try:
+                    meta = self._meta.get(image_path)
+                    if meta is None:
+                        st = os.stat(image_path)
+                        meta = (st.st_size, st.st_mtime, None, None)
+
+                    # 读取文件头获取尺寸（不解码像素）
+                    if meta[2] is None:
+                        width, height = get_image_size(image_path)
+                        meta = (meta[0], meta[1], width, height)
+                        self._meta[image_path] = meta
+
+                    batch.append((item_id, f"{meta[2]}×{meta[3]}", format_file_size(meta[0])))
+
+                except Exception as e:
+                    self.logger.error(f"读取图片信息失败 {image_path}: {e}")
+                    batch.append((item_id, "未知", "未知"))
+
+                if len(batch) >= _DETAILS_BATCH_SIZE or time.monotonic() - last_flush >= _DETAILS_BATCH_INTERVAL:
+                    # 更新界面需在主线程执行：交给 _drain_details 取出
+                    self._details_queue.put((generation, batch, False))
+                    batch = []
+                    last_flush = time.monotonic()
+        finally:
+            # 结束标记（附带剩余的结果），列表已重建而提前返回时同样发出
+            self._details_queue.put((generation, batch, True))
+
+    def _drain_details(self):
+        """主线程：取出后台加载的图片信息并更新列表，加载任务全部结束后停止检查"""
+        try:
+            while True:
+                generation, batch, done = self._details_queue.get_nowait()
+                if done:
+                    self._details_active -= 1
+                if batch:
+                    self._update_tree_items(generation, batch)
+        except queue.Empty:
+            pass
+
+        if self._details_active > 0:
+            self.parent_frame.after(_DETAILS_POLL_INTERVAL, self._drain_details)
+
+    def _update_tree_items(self, generation: int, batch: List[tuple]):
+        """批量更新列表项
+
+        Args:
+            generation: 信息加载线程的批次号，列表已重建时忽略
+            batch: (列表项ID, 尺寸文本, 文件大小文本) 列表
+        """
+        if generation != self._details_generation:
+            return
+        for item_id, size_text, file_size in batch:
+            if self.image_tree.exists(item_id):
+                current_values = self.image_tree.item(item_id)['values']
+                if current_values:
+                    self.image_tree.item(item_id, values=(current_values[0], size_text, file_size))
 
     def update_file_info(self):
         """更新文件信息"""
         count = len(self.image_files)
         if count > 0:
-            total_size = sum(os.path.getsize(f) for f in self.image_files if os.path.exists(f))
+            total_size = sum(self._get_file_size(f) for f in self.image_files)
             size_text = format_file_size(total_size)
             self.file_count_label.config(text=f"共 {count} 个图片 (总大小: {size_text})")
         else:
             self.file_count_label.config(text="未选择图片")
 
+    def _get_file_size(self, image_path: str) -> int:
+        """获取文件大小（优先使用缓存，文件不存在时为0）"""
+        meta = self._meta.get(image_path)
+        if meta is not None:
+            return meta[0]
+        try:
+            return os.path.getsize(image_path)
+        except OSError:
+            return 0
+
     def on_tree_select(self, event):
         """树形控件选择事件"""
         selection = self.image_tree.selection()
@@ -377,28 +636,40 @@ class PdfConverter:
 
         try:
             image_path = self.image_files[index]
-            image = Image.open(image_path)
 
             # 调整图片大小以适应预览区域
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
 
-            if canvas_width > 1 and canvas_height > 1:
-                image.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
+            # 画布尺寸按10像素取整，窗口微小变化时仍可命中缓存
+            mtime = self._meta.get(image_path, (None, None))[1]
+            key = (image_path, mtime, canvas_width // 10 * 10, canvas_height // 10 * 10)
+            photo = self._preview_cache.get(key)
+            if photo is not None:
+                self._preview_cache.move_to_end(key)
+            else:
+                # 转换为PhotoImage后立即关闭文件，不占用文件句柄
+                with Image.open(image_path) as image:
+                    if canvas_width > 1 and canvas_height > 1:
+                        # thumbnail() 对JPEG会先调用 draft()，在DCT域按1/2~1/8缩小解码，不完整解码大图
+                        image.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
+
+                    photo = ImageTk.PhotoImage(image)
 
-            # 转换为PhotoImage
-            photo = ImageTk.PhotoImage(image)
+                self._preview_cache[key] = photo
+                if len(self._preview_cache) > self._preview_cache_max:
+                    self._preview_cache.popitem(last=False)
 
             # 清空画布并显示图片
             self.preview_canvas.delete('all')
-            x = (canvas_width - image.width) // 2
-            y = (canvas_height - image.height) // 2
+            x = (canvas_width - photo.width()) // 2
+            y = (canvas_height - photo.height()) // 2
             self.preview_canvas.create_image(x, y, anchor='nw', image=photo)
             self.preview_canvas.image = photo  # 保持引用
 
             # 更新信息
             filename = os.path.basename(image_path)
-            info_text = f"{filename}\n尺寸: {image.width}×{image.height}"
+            info_text = f"{filename}\n尺寸: {photo.width()}×{photo.height()}"
             self.preview_info.config(text=info_text)
 
         except Exception as e:
@@ -416,16 +687,12 @@ class PdfConverter:
             return
 
         # 交换位置
-        self.image_files[self.selected_index - 1], self.image_files[self.selected_index] = \
-            self.image_files[self.selected_index], self.image_files[self.selected_index - 1]
-
-        # 更新列表
-        self.update_image_list()
+        self._swap(self.selected_index - 1, self.selected_index)
 
         # 重新选择
         self.selected_index -= 1
         if self.selected_index >= 0:
-            item = self.image_tree.get_children()[self.selected_index]
+            item = self._iids[self.selected_index]
             self.image_tree.selection_set(item)
             self.image_tree.see(item)
 
@@ -435,29 +702,41 @@ class PdfConverter:
             return
 
         # 交换位置
-        self.image_files[self.selected_index], self.image_files[self.selected_index + 1] = \
-            self.image_files[self.selected_index + 1], self.image_files[self.selected_index]
-
-        # 更新列表
-        self.update_image_list()
+        self._swap(self.selected_index, self.selected_index + 1)
 
         # 重新选择
         self.selected_index += 1
         if self.selected_index < len(self.image_files):
-            item = self.image_tree.get_children()[self.selected_index]
+            item = self._iids[self.selected_index]
             self.image_tree.selection_set(item)
             self.image_tree.see(item)
 
+    def _swap(self, index: int, next_index: int):
+        """交换相邻两张图片的顺序（只移动对应的列表项，不重建列表）"""
+        # 涉及尚未插入的行时先插入剩余的行
+        while self._rows_inserted <= next_index:
+            self._insert_rows(self._details_generation)
+
+        self.image_files[index], self.image_files[next_index] = \
+            self.image_files[next_index], self.image_files[index]
+        self._iids[index], self._iids[next_index] = self._iids[next_index], self._iids[index]
+        self.image_tree.move(self._iids[index], '', index)
+
     def remove_selected(self):
         """删除选中的图片"""
         if self.selected_index < 0 or self.selected_index >= len(self.image_files):
             return
 
-        # 删除文件
-        del self.image_files[self.selected_index]
+        # 删除文件及对应的列表项
+        removed_path = self.image_files.pop(self.selected_index)
+        self.image_tree.delete(self._iids.pop(self.selected_index))
+        self._rows_inserted -= 1
+
+        # 释放该图片的预览缓存（同一文件仍在列表中时保留）
+        if removed_path not in self.image_files:
+            for key in [key for key in self._preview_cache if key[0] == removed_path]:
+                del self._preview_cache[key]
 
-        # 更新列表
-        self.update_image_list()
         self.update_file_info()
 
         # 清空预览
@@ -471,6 +750,7 @@ class PdfConverter:
 
         if messagebox.askyesno("确认", "确定要清空所有图片吗？"):
             self.image_files = []
+            self._preview_cache.clear()
             self.update_image_list()
             self.update_file_info()
             self.clear_preview()
@@ -545,60 +825,63 @@ class PdfConverter:
 
             # 获取参数
             quality = self.quality_var.get()
+            # 勾选"按页面大小缩小图片"时把图片限制在页面的300 DPI分辨率内，否则保留原始分辨率
+            max_size = _PAGE_PIXELS.get(self.page_size_var.get()) if self.downscale_var.get() else None
             
-            # 准备图片数据
-            pdf_bytes = []
+            # 准备图片数据：多进程并行解码与JPEG编码，按原顺序取回结果；
+            # 编码结果写入临时文件，本进程只传递文件路径，不持有图片数据
+            page_files = []
             total_images = len(self.image_files)
-            
-            import io
-            
-            for i, image_path in enumerate(self.image_files):
-                if self.stop_requested:
-                    raise Exception("用户停止")
+            max_workers = min(os.cpu_count() or 1, total_images)
+            # 在途任务上限，编码进度不会远超取回进度
+            window = max_workers * 2
+
+            with tempfile.TemporaryDirectory() as tmp_dir, \
+                    ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque()
+                image_iter = enumerate(self.image_files)
+
+                for i in range(total_images):
+                    if self.stop_requested:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise Exception("用户停止")
+
+                    # 补足在途任务，再按顺序取出下一页
+                    while len(pending) < window:
+                        next_item = next(image_iter, None)
+                        if next_item is None:
+                            break
+                        page_path = os.path.join(tmp_dir, f"{next_item[0]:06d}.jpg")
+                        pending.append((
+                            next_item[1],
+                            executor.submit(_encode_page, next_item[1], quality, page_path, max_size)
+                        ))
+
+                    image_path, future = pending.popleft()
+
+                    # 进度与状态合并为一条消息，每张图片只唤醒一次界面
+                    self.message_queue.put({
+                        'type': 'tick',
+                        'data': (
+                            (i / total_images) * 90,  # 预留10%给PDF生成
+                            f"正在处理图片 ({i+1}/{total_images}): {os.path.basename(image_path)}"
+                        )
+                    })
+
+                    try:
+                        page_files.append(future.result())
+                    except Exception as e:
+                        self.logger.error(f"处理图片失败 {image_path}: {e}")
+                        # 如果处理失败，尝试直接使用原文件（作为后备）
+                        page_files.append(image_path)
 
                 self.message_queue.put({
                     'type': 'status',
-                    'data': f"正在处理图片 ({i+1}/{total_images}): {os.path.basename(image_path)}"
-                })
-                self.message_queue.put({
-                    'type': 'progress',
-                    'data': (i / total_images) * 90  # 预留10%给PDF生成
+                    'data': "正在合成PDF文件..."
                 })
 
-                try:
-                    with Image.open(image_path) as img:
-                        # 转换Exif方向
-                        from PIL import ImageOps
-                        img = ImageOps.exif_transpose(img)
-                        
-                        # 如果需要压缩（质量<100），则转换为JPEG
-                        # 注意：如有透明通道需预处理
-                        if img.mode == 'RGBA':
-                            background = Image.new('RGB', img.size, (255, 255, 255))
-                            background.paste(img, mask=img.split()[-1])
-                            img = background
-                        elif img.mode != 'RGB':
-                            img = img.convert('RGB')
-                            
-                        # 保存到内存
-                        img_byte_arr = io.BytesIO()
-                        img.save(img_byte_arr, format='JPEG', quality=quality)
-                        pdf_bytes.append(img_byte_arr.getvalue())
-                        
-                except Exception as e:
-                    self.logger.error(f"处理图片失败 {image_path}: {e}")
-                    # 如果处理失败，尝试直接读取原文件（作为后备）
-                    with open(image_path, "rb") as f:
-                         pdf_bytes.append(f.read())
-
-            self.message_queue.put({
-                'type': 'status',
-                'data': "正在合成PDF文件..."
-            })
-
-            # 生成PDF
-            with open(output_path, "wb") as f:
-                f.write(img2pdf.convert(pdf_bytes))
+                # 生成PDF：在子进程中构建PDF对象并直接写入文件，不占用界面进程的GIL
+                executor.submit(_write_pdf, page_files, output_path).result()
 
             # 完成
             self.message_queue.put({
@@ -674,12 +957,18 @@ class PdfConverter:
             self.page_size_var.set(pdf_config.get('page_size', 'A4'))
             self.orientation_var.set(pdf_config.get('orientation', 'portrait'))
             self.margin_var.set(pdf_config.get('margin', 10))
+            self.downscale_var.set(pdf_config.get('downscale', False))
 
             self.quality_label.config(text=f"{self.quality_var.get()}%")
 
         except Exception as e:
             self.logger.error(f"加载设置失败: {e}")
 
+    def close(self):
+        """关闭工具：停止加载图片信息并释放线程池"""
+        self._details_generation += 1
+        self._details_executor.shutdown(wait=False, cancel_futures=True)
+
     def save_settings(self):
         """保存设置"""
         try:
@@ -687,7 +976,8 @@ class PdfConverter:
                 'quality': self.quality_var.get(),
                 'page_size': self.page_size_var.get(),
                 'orientation': self.orientation_var.get(),
-                'margin': self.margin_var.get()
+                'margin': self.margin_var.get(),
+                'downscale': self.downscale_var.get()
             }
 
             self.config_manager.update_section('pdf', pdf_settings)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JPEG页面PDF写出模块
+每页JPEG数据原样（DCTDecode）流式写入PDF文件，写完一页即释放，内存占用与页数无关。
+页面尺寸、颜色空间的处理方式与img2pdf的默认行为一致。
+"""
+
+import os
+import shutil
+from typing import BinaryIO, List, Optional, Tuple
+from PIL import Image
+
+# 未记录DPI的图片按96 DPI确定页面尺寸（与img2pdf一致）
+DEFAULT_DPI = 96
+
+# PDF页面尺寸上下限（pt）
+_MIN_PAGE_PT = 3
+_MAX_PAGE_PT = 14400
+
+# 图片模式 -> (PDF颜色空间, 通道数)
+_COLOR_SPACES = {
+    'L': (b'/DeviceGray', 1),
+    'RGB': (b'/DeviceRGB', 3),
+    'CMYK': (b'/DeviceCMYK', 4),
+}
+
+# 复制图片数据时的缓冲区大小
+_COPY_BUFSIZE = 1024 * 1024
+
+def _pdf_number(value: float) -> bytes:
+    """格式化PDF数值（最多4位小数，去掉多余的0）"""
+    return (b'%.4f' % value).rstrip(b'0').rstrip(b'.')
+
+def read_jpeg_page(path: str) -> Optional[Tuple]:
+    """读取JPEG文件头，获取嵌入PDF所需的信息（不解码像素）
+
+    Returns:
+        (宽, 高, 模式, 页面宽pt, 页面高pt, ICC配置, 是否Adobe CMYK)；
+        不是可直接嵌入的JPEG时返回None
+    """
+    try:
+        with Image.open(path) as im:
+            if im.format != 'JPEG' or im.mode not in _COLOR_SPACES:
+                return None
+
+            dpi = im.info.get('dpi') or (DEFAULT_DPI, DEFAULT_DPI)
+            dpi = (int(round(dpi[0])), int(round(dpi[1])))
+            if dpi == (0, 0):
+                dpi = (DEFAULT_DPI, DEFAULT_DPI)
+            if dpi[0] <= 0 or dpi[1] <= 0:
+                return None
+
+            width_pt = im.width * 72 / dpi[0]
+            height_pt = im.height * 72 / dpi[1]
+            if not (_MIN_PAGE_PT <= width_pt <= _MAX_PAGE_PT and _MIN_PAGE_PT <= height_pt <= _MAX_PAGE_PT):
+                return None
+
+            return (im.width, im.height, im.mode, width_pt, height_pt,
+                    im.info.get('icc_profile'), 'adobe' in im.info)
+    except OSError:
+        return None
+
+def write_jpeg_pdf(fp: BinaryIO, page_files: List[str], pages: List[Tuple]):
+    """将JPEG页面逐页写入PDF
+
+    Args:
+        fp: 以'wb'打开的输出文件
+        page_files: 各页JPEG文件路径
+        pages: 各页对应的 read_jpeg_page 结果
+    """
+    # 对象1为文档目录，对象2为页面树，最后写出；其余对象按顺序编号
+    offsets = {}
+    next_num = 3
+    page_nums = []
+
+    def begin_object(num: int):
+        offsets[num] = fp.tell()
+        fp.write(b'%d 0 obj\n' % num)
+
+    def write_stream(num: int, header: bytes, data: bytes = None, path: str = None):
+        """写出流对象（数据来自字节串或文件）"""
+        begin_object(num)
+        if path is not None:
+            with open(path, 'rb') as src:
+                length = os.fstat(src.fileno()).st_size
+                fp.write(b'<< %s /Length %d >>\nstream\n' % (header, length))
+                shutil.copyfileobj(src, fp, _COPY_BUFSIZE)
+        else:
+            fp.write(b'<< %s /Length %d >>\nstream\n' % (header, len(data)))
+            fp.write(data)
+        fp.write(b'\nendstream\nendobj\n')
+
+    fp.write(b'%PDF-1.3\n%\xe2\xe3\xcf\xd3\n')
+
+    for path, (width, height, mode, width_pt, height_pt, icc_profile, adobe) in zip(page_files, pages):
+        color_space, components = _COLOR_SPACES[mode]
+
+        if icc_profile:
+            icc_num, next_num = next_num, next_num + 1
+            write_stream(icc_num, b'/N %d' % components, data=icc_profile)
+            color_space = b'[/ICCBased %d 0 R]' % icc_num
+
+        image_num, content_num, page_num = next_num, next_num + 1, next_num + 2
+        next_num += 3
+
+        header = (b'/Type /XObject /Subtype /Image /Filter /DCTDecode /Width %d /Height %d '
+                  b'/ColorSpace %s /BitsPerComponent 8' % (width, height, color_space))
+        if mode == 'CMYK' and adobe:
+            # Adobe CMYK JPEG 的通道值是反相的
+            header += b' /Decode [1 0 1 0 1 0 1 0]'
+        write_stream(image_num, header, path=path)
+
+        # 图片铺满页面
+        w, h = _pdf_number(width_pt), _pdf_number(height_pt)
+        write_stream(content_num, b'', data=b'q\n%s 0 0 %s 0 0 cm\n/Im0 Do\nQ' % (w, h))
+
+        begin_object(page_num)
+        fp.write(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %s %s] '
+                 b'/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>\nendobj\n'
+                 % (w, h, image_num, content_num))
+        page_nums.append(page_num)
+
+    begin_object(2)
+    kids = b' '.join(b'%d 0 R' % num for num in page_nums)
+    fp.write(b'<< /Type /Pages /Kids [%s] /Count %d >>\nendobj\n' % (kids, len(page_nums)))
+
+    begin_object(1)
+    fp.write(b'<< /Type /Catalog /Pages 2 0 R >>\nendobj\n')
+
+    # 交叉引用表与文件尾
+    xref_offset = fp.tell()
+    fp.write(b'xref\n0 %d\n0000000000 65535 f \n' % next_num)
+    for num in range(1, next_num):
+        fp.write(b'%010d 00000 n \n' % offsets[num])
+    fp.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (next_num, xref_offset))
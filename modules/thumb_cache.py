@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缩略图缓存模块
+按 (文件路径, 修改时间, 缩略图尺寸) 将缩略图缓存到磁盘，重复加载同一文件夹时无需再解码原图
+"""
+
+import os
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional, Tuple
+from PIL import Image, features
+
+# 缓存目录
+THUMB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pictool", "thumbs")
+
+# 缓存格式：优先WEBP，Pillow未编译WEBP支持时使用PNG
+if features.check('webp'):
+    _CACHE_FORMAT, _CACHE_EXT = 'WEBP', '.webp'
+else:
+    _CACHE_FORMAT, _CACHE_EXT = 'PNG', '.png'
+
+# 缓存容量上限：超过任一上限时按最近使用时间淘汰最旧的缓存文件
+_MAX_CACHE_FILES = 5000
+_MAX_CACHE_BYTES = 200 * 1024 * 1024
+# 淘汰后保留的比例，避免每次写入都触发清理
+_PRUNE_TARGET_RATIO = 0.8
+# 每写入多少个缓存文件检查一次容量（进程内首次写入时也会检查）
+_PRUNE_CHECK_INTERVAL = 200
+
+logger = logging.getLogger("ThumbCache")
+
+_prune_lock = threading.Lock()
+_writes_since_prune = None
+
+def _cache_path(image_path: str, mtime: float, size: Tuple[int, int]) -> str:
+    """计算缩略图缓存文件路径（源文件修改后键随之变化，旧缓存自然失效）"""
+    key = f"{os.path.abspath(image_path)}|{mtime!r}|{size[0]}x{size[1]}"
+    return os.path.join(THUMB_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + _CACHE_EXT)
+
+def prune_cache(max_files: int = _MAX_CACHE_FILES, max_bytes: int = _MAX_CACHE_BYTES) -> int:
+    """缓存超出上限时删除最久未使用的缓存文件
+
+    Args:
+        max_files: 缓存文件数上限
+        max_bytes: 缓存总字节数上限
+
+    Returns:
+        删除的文件数
+    """
+    entries = []
+    total_bytes = 0
+    now = time.time()
+    try:
+        with os.scandir(THUMB_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith('.tmp'):
+                    # 写入中途崩溃遗留的临时文件，超过一小时直接清理
+                    if now - stat.st_mtime > 3600:
+                        entries.append((0.0, stat.st_size, entry.path))
+                        total_bytes += stat.st_size
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+    except FileNotFoundError:
+        return 0
+
+    if len(entries) <= max_files and total_bytes <= max_bytes:
+        return 0
+
+    target_files = int(max_files * _PRUNE_TARGET_RATIO)
+    target_bytes = int(max_bytes * _PRUNE_TARGET_RATIO)
+    # 修改时间即最近使用时间（命中缓存时会刷新），最旧的优先删除
+    entries.sort()
+    remaining = len(entries)
+    removed = 0
+    for _, file_size, path in entries:
+        if remaining <= target_files and total_bytes <= target_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        remaining -= 1
+        total_bytes -= file_size
+        removed += 1
+
+    logger.info(f"缩略图缓存已清理 {removed} 个文件")
+    return removed
+
+def _maybe_prune_cache():
+    """进程内首次写入及之后每写入一定数量的缓存文件时检查容量"""
+    global _writes_since_prune
+    with _prune_lock:
+        if _writes_since_prune is not None and _writes_since_prune < _PRUNE_CHECK_INTERVAL:
+            _writes_since_prune += 1
+            return
+        _writes_since_prune = 0
+    try:
+        prune_cache()
+    except Exception as e:
+        logger.warning(f"清理缩略图缓存失败: {e}")
+
+def get_thumbnail(image_path: str, size: Tuple[int, int] = (100, 100),
+                  mtime: Optional[float] = None) -> Image.Image:
+    """获取图片缩略图（优先读取磁盘缓存，可在后台线程调用）
+
+    Args:
+        image_path: 图片文件路径
+        size: 缩略图最大尺寸
+        mtime: 文件修改时间（已知时传入，省去一次 stat）
+
+    Returns:
+        已加载像素数据的缩略图
+    """
+    if mtime is None:
+        mtime = os.stat(image_path).st_mtime
+    cache_file = _cache_path(image_path, mtime, size)
+
+    try:
+        with Image.open(cache_file) as cached:
+            thumbnail = cached.copy()
+        # 刷新修改时间，容量清理时按最近使用淘汰
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        return thumbnail
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"读取缩略图缓存失败 {cache_file}: {e}")
+
+    # JPEG在DCT域预缩小到目标尺寸的2倍左右，避免完整解码大图（其他格式无影响）
+    image = Image.open(image_path)
+    image.draft('RGB', (size[0] * 2, size[1] * 2))
+    # 界面缩略图尺寸很小，BILINEAR 与 LANCZOS 肉眼无差别且更快；
+    # GIF 预览与生成仍使用 LANCZOS
+    image.thumbnail(size, Image.Resampling.BILINEAR)
+
+    # 先写临时文件再替换，多个线程同时生成同一缩略图时互不干扰
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        image.save(tmp_file, format=_CACHE_FORMAT)
+        os.replace(tmp_file, cache_file)
+    except Exception as e:
+        logger.warning(f"写入缩略图缓存失败 {cache_file}: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    else:
+        _maybe_prune_cache()
+
+    return image
@@ -11,17 +11,247 @@ import time
 import threading
 import queue
 import logging
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, colorchooser
-from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageOps, ExifTags, ImageStat
+import PIL
+from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageOps, ExifTags
 from typing import List, Optional, Callable, Dict, Any, Tuple
 
 from utils import (
-    get_image_files, is_image_file, format_file_size,
+    get_image_files_info, get_image_size, is_image_file, format_file_size,
     create_output_folder, safe_filename, handle_exception,
     get_exif_datetime, is_chinese_char, contains_chinese
 )
 
+# 后台加载图片信息时，界面更新的批大小与最长间隔（秒）
+_DETAILS_BATCH_SIZE = 50
+_DETAILS_BATCH_INTERVAL = 0.05
+# 主线程取回后台加载结果的检查间隔（毫秒）
+_DETAILS_POLL_INTERVAL = 50
+
+# 图片列表每批插入的行数（首批同步插入，其余在主循环空闲时插入）
+_TREE_INSERT_CHUNK = 200
+
+def _process_dynamic_text(text, image):
+    """处理动态文本占位符"""
+    if "{exif_date}" in text:
+        exif_date = get_exif_datetime(image)
+        replace_text = exif_date if exif_date else "N/A"
+        text = text.replace("{exif_date}", replace_text)
+    return text
+
+@functools.lru_cache(maxsize=64)
+def _load_font(font_name, size):
+    """加载字体（按字体与字号缓存，避免每次绘制和测量都重新解析字体文件）
+
+    Args:
+        font_name: 字体文件名，None表示使用默认字体
+        size: 字号
+    """
+    if font_name is None:
+        return ImageFont.load_default()
+    try:
+        return ImageFont.truetype(font_name, max(1, size))
+    except Exception:
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=256)
+def _text_bbox(text, font_name, size, stroke_width=0):
+    """测量文本在指定字体、字号（及描边宽度）下绘制于(0, 0)时的边界框（结果缓存，同一批图片的测量可复用）"""
+    temp_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    return temp_draw.textbbox((0, 0), text, font=_load_font(font_name, size), stroke_width=stroke_width)
+
+def _font_name(text, params):
+    """根据文本内容选择中文或英文字体"""
+    return params['font_chinese'] if contains_chinese(text) else params['font_english']
+
+def _calculate_adaptive_font_size(text, image_size, params):
+    """计算自适应字体大小"""
+    img_w, img_h = image_size
+
+    # 目标宽度为图片宽度的80%
+    target_width = img_w * 0.8
+    min_size = max(10, int(min(img_w, img_h) * 0.02))
+    max_size = int(min(img_w, img_h) * 0.3)
+
+    if max_size <= min_size:
+        return min_size
+
+    font_name = _font_name(text, params)
+
+    def text_width(size):
+        bbox = _text_bbox(text, font_name, size)
+        return bbox[2] - bbox[0]
+
+    # 文本宽度与字号基本成正比：在参考字号下测量一次即可估算最佳字号
+    size_ref = max(min_size, min(params['font_size'], max_size))
+    width_ref = text_width(size_ref)
+    if width_ref <= 0:
+        return max_size
+    best_size = max(min_size, min(int(size_ref * target_width / width_ref), max_size))
+
+    # 字形微调（hinting）使宽度并非严格成正比，逐级修正到恰好不超过目标宽度的最大字号
+    while best_size > min_size and text_width(best_size) > target_width:
+        best_size -= 1
+    while best_size < max_size and text_width(best_size + 1) <= target_width:
+        best_size += 1
+
+    return best_size
+
+def _calculate_position(image_size, text_size, position):
+    """计算水印位置"""
+    img_w, img_h = image_size
+    text_w, text_h = text_size
+    margin = 10
+
+    if position == "左上角":
+        return margin, margin
+    elif position == "右上角":
+        return img_w - text_w - margin, margin
+    elif position == "左下角":
+        return margin, img_h - text_h - margin
+    elif position == "右下角":
+        return img_w - text_w - margin, img_h - text_h - margin
+    elif position == "中心":
+        return (img_w - text_w) // 2, (img_h - text_h) // 2
+    else:
+        return margin, margin
+
+def _is_dark(rgb):
+    """判断颜色是否偏暗（整数近似 0.299R + 0.587G + 0.114B，权重放大256倍）"""
+    return (rgb[0] * 77 + rgb[1] * 150 + rgb[2] * 29) >> 8 < 128
+
+def _add_watermark(image, text, params):
+    """为图片添加水印
+
+    RGB、RGBA图片直接在传入的图片上绘制，其他模式转换为RGBA后绘制。
+
+    Args:
+        image: 原图
+        text: 水印文本（已替换动态占位符）
+        params: 水印参数快照，见 WatermarkTool.get_watermark_params
+
+    Returns:
+        添加水印后的图片
+    """
+    # RGB图片保持原模式（保存为JPEG时无需整图转为RGBA再转回RGB）
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+
+    # 计算字体大小
+    if params['multi_size']:
+        font_size = _calculate_adaptive_font_size(text, image.size, params)
+    else:
+        font_size = params['font_size']
+
+    # 获取字体
+    font_name = _font_name(text, params)
+    font = _load_font(font_name, font_size)
+
+    # 高对比度模式：文字加一圈与填充色反差最大的黑/白描边，在任何背景上都清晰可辨
+    stroke_width = max(1, font_size // 20) if params['high_contrast'] else 0
+
+    # 计算文本尺寸（含描边）
+    bbox = _text_bbox(text, font_name, font_size, stroke_width)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    # 计算位置
+    x, y = _calculate_position(image.size, (text_width, text_height), params['position'])
+
+    # 确定颜色
+    color = params['color']
+    opacity_value = int(params['opacity'] * 255 / 100)
+    fill_color = (*color, opacity_value)
+    stroke_fill = (255, 255, 255, opacity_value) if _is_dark(color) else (0, 0, 0, opacity_value)
+
+    # 水印只绘制在与文本边界框同大小的透明图层上，再合成到原图对应区域，
+    # 无需创建和合成整张图片大小的水印层
+    watermark = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(watermark)
+    # 描边与文字一次绘制完成
+    draw.text((-bbox[0], -bbox[1]), text, font=font, fill=fill_color,
+              stroke_width=stroke_width, stroke_fill=stroke_fill)
+
+    # 合成图片（超出原图的部分自动裁掉）
+    dest = (x + bbox[0], y + bbox[1])
+    if image.mode == 'RGB':
+        # 不透明底图上以水印alpha为蒙版粘贴，结果与alpha合成完全一致
+        image.paste(watermark, dest, mask=watermark)
+    else:
+        image.alpha_composite(watermark, dest)
+    return image
+
+def _save_image(image, output_path, original_format, params):
+    """保存图片
+
+    水印副本优先保存速度：JPEG单遍编码，PNG低压缩级别，WEBP最快编码方式
+    """
+    # Prepare format
+    save_format = original_format if original_format else 'PNG'
+
+    # Handle JPEG specifics
+    if save_format.upper() in ('JPEG', 'JPG'):
+        # JPEG supports no alpha, convert to RGB if needed
+        if image.mode == 'RGBA':
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            # RGBA图片本身作为蒙版时直接使用其alpha通道
+            background.paste(image, mask=image)
+            image = background
+        image.save(output_path, 'JPEG', quality=params['jpeg_quality'],
+                   optimize=False, progressive=False, subsampling=2)
+
+    # Handle other formats
+    elif save_format.upper() == 'PNG':
+        image.save(output_path, 'PNG', compress_level=params['png_compress_level'])
+    elif save_format.upper() == 'WEBP':
+        image.save(output_path, 'WEBP', quality=90, method=0)
+    else:
+        # Fallback for unknown formats, try to save as is or default to PNG if it fails
+        try:
+            image.save(output_path, save_format)
+        except Exception:
+            # If saving with original format fails (e.g. BMP with alpha), fall back to PNG
+            if not output_path.lower().endswith('.png'):
+                output_path = os.path.splitext(output_path)[0] + '.png'
+            image.save(output_path, 'PNG', compress_level=params['png_compress_level'])
+
+def _init_worker(text, params):
+    """进程池工作进程初始化：预先加载字体并测量文本，首张图片无需等待字体解析
+
+    Args:
+        text: 水印文本（可能含动态占位符）
+        params: 水印参数快照
+    """
+    font_name = _font_name(text, params)
+    font_size = params['font_size']
+    _load_font(font_name, font_size)
+
+    # 不含动态占位符时文本固定，固定字号下的边界框可直接复用
+    if '{' not in text and not params['multi_size']:
+        stroke_width = max(1, font_size // 20) if params['high_contrast'] else 0
+        _text_bbox(text, font_name, font_size, stroke_width)
+
+def _watermark_file(image_path, output_folder, text, params):
+    """为单个图片文件添加水印并保存到输出文件夹（在进程池中执行）"""
+    with Image.open(image_path) as image:
+        # 原地转换方向（方向正常时不复制图片）；转换后 format 不再可靠，需先记下原格式
+        original_format = image.format
+        ImageOps.exif_transpose(image, in_place=True)
+
+        # 处理动态文本
+        processed_text = _process_dynamic_text(text, image)
+
+        # 添加水印
+        watermarked = _add_watermark(image, processed_text, params)
+
+        # 保存文件
+        output_path = os.path.join(output_folder, os.path.basename(image_path))
+        _save_image(watermarked, output_path, original_format, params)
+
 class WatermarkTool:
     """水印工具主类"""
 
@@ -45,6 +275,26 @@ class WatermarkTool:
         self.is_processing = False
         self.stop_requested = False
 
+        # 图片信息缓存：路径 -> (文件大小, 修改时间, 宽, 高)，宽高未读取时为None
+        self._meta = {}
+        # 信息加载批次号，列表重建后旧批次的结果直接丢弃
+        self._details_generation = 0
+        # 已插入列表的行数（大文件夹分批插入）
+        self._rows_inserted = 0
+        # 后台读取图片尺寸（单线程，按列表顺序加载）
+        self._details_executor = ThreadPoolExecutor(max_workers=1)
+        # 后台线程只把结果放入队列，由主线程定时取出更新列表（Tk控件只能在主线程操作）
+        self._details_queue = queue.Queue()
+        # 尚未结束的加载任务数（仅在主线程读写），为0时停止检查队列
+        self._details_active = 0
+        # 预览图缓存（LRU）：(路径, 修改时间, 画布宽, 画布高) -> PhotoImage
+        self._preview_cache = OrderedDict()
+        self._preview_cache_max = 32
+        # 已按EXIF方向转换的原图缓存（LRU）：(路径, 修改时间) -> Image，
+        # 反复预览水印效果时无需重新解码；原图较大，只保留少量
+        self._image_cache = OrderedDict()
+        self._image_cache_max = 4
+
         # 水印参数变量
         self.watermark_text = tk.StringVar(value="MU Group Leo: +86 13819858718")
         self.font_size = tk.IntVar(value=40)
@@ -54,6 +304,9 @@ class WatermarkTool:
         self.multi_size_var = tk.BooleanVar(value=True)
         self.multi_size_var = tk.BooleanVar(value=True)
         self.high_contrast_var = tk.BooleanVar(value=True)
+        # 输出编码参数（界面不提供设置，可在配置文件中修改）
+        self.jpeg_quality = 92
+        self.png_compress_level = 1
 
         # 选中项
         self.selected_index = -1
@@ -92,6 +345,10 @@ class WatermarkTool:
 
             self.logger.info(f"字体初始化完成 - 英文: {self.font_english}, 中文: {self.font_chinese}")
 
+            # Pillow-SIMD 的版本号带 .postN 后缀
+            if '.post' not in PIL.__version__:
+                self.logger.info("未使用 Pillow-SIMD，安装后可加速水印的合成、缩放与格式转换（见 requirements.txt）")
+
         except Exception as e:
             self.logger.error(f"字体初始化失败: {e}")
             self.font_english = ImageFont.load_default()
@@ -135,15 +392,34 @@ class WatermarkTool:
         size_frame = ttk.Frame(font_frame)
         size_frame.pack(fill='x', pady=(0, 5))
         ttk.Label(size_frame, text="字体大小:").pack(side='left')
-        
-        def validate_size(*args):
+
+        # 验证回调：连续写入（输入、拖动滑块、加载设置）合并为50ms后的一次校验
+        self._validate_pending = False
+
+        def validate_settings():
             try:
-                val = self.font_size.get()
-                if val < 1: self.font_size.set(1)
+                if self.font_size.get() < 1: self.font_size.set(1)
             except:
                 pass
-        self.font_size.trace_add('write', validate_size)
-        
+            try:
+                val = self.opacity.get()
+                if val < 0: self.opacity.set(0)
+                if val > 100: self.opacity.set(100)
+                self.opacity_label.config(text=f"{int(self.opacity.get())}%")
+            except:
+                pass
+            finally:
+                # 校验中的 set() 触发的回调在此之前被忽略，不会重复校验
+                self._validate_pending = False
+
+        def schedule_validate(*args):
+            if self._validate_pending:
+                return
+            self._validate_pending = True
+            self.parent_frame.after(50, validate_settings)
+
+        self.font_size.trace_add('write', schedule_validate)
+
         ttk.Spinbox(size_frame, from_=10, to=200, textvariable=self.font_size, width=10).pack(side='right')
 
         # 多尺寸适配
@@ -160,18 +436,8 @@ class WatermarkTool:
         opacity_frame = ttk.Frame(style_frame)
         opacity_frame.pack(fill='x', pady=(0, 5))
         ttk.Label(opacity_frame, text="透明度:").pack(side='left')
-        
-        # 验证函数
-        def validate_opacity(*args):
-             try:
-                 val = self.opacity.get()
-                 if val < 0: self.opacity.set(0)
-                 if val > 100: self.opacity.set(100)
-                 self.opacity_label.config(text=f"{int(self.opacity.get())}%")
-             except:
-                 pass
-        
-        self.opacity.trace_add('write', validate_opacity)
+
+        self.opacity.trace_add('write', schedule_validate)
 
         opacity_scale = ttk.Scale(
             opacity_frame, from_=0, to=100, variable=self.opacity, orient='horizontal', length=150
@@ -316,22 +582,122 @@ class WatermarkTool:
 
     def update_image_list(self):
         """更新图片列表"""
-        # 清空现有项目
-        for item in self.image_tree.get_children():
-            self.image_tree.delete(item)
+        # 清空现有项目（一次调用删除全部行，而非逐行删除）
+        children = self.image_tree.get_children()
+        if children:
+            self.image_tree.delete(*children)
 
-        # 添加图片项目
-        for i, image_path in enumerate(self.image_files):
-            try:
-                filename = os.path.basename(image_path)
-                file_size = format_file_size(os.path.getsize(image_path))
-                # 简单加载尺寸，优化性能
-                with Image.open(image_path) as img:
-                     size_text = f"{img.width}×{img.height}"
-                
-                self.image_tree.insert('', 'end', iid=str(i), values=(filename, size_text, file_size))
-            except Exception as e:
-                self.logger.error(f"读取图片信息失败 {image_path}: {e}")
+        self._rows_inserted = 0
+        self._details_generation += 1
+        self._insert_rows(self._details_generation)
+
+    def _insert_rows(self, generation: int):
+        """插入下一批列表项，并在后台加载这批缺少的详细信息
+
+        大文件夹的列表分批插入，每批之间让出主循环，界面不会长时间无响应。
+        """
+        if generation != self._details_generation:
+            return
+
+        start = self._rows_inserted
+        end = min(start + _TREE_INSERT_CHUNK, len(self.image_files))
+
+        # 先添加文件名和大小（扫描目录时已取得），已缓存的直接显示尺寸，
+        # 其余在后台读取文件头后再更新，界面不必等待逐个打开图片
+        pending = []
+        for i in range(start, end):
+            image_path = self.image_files[i]
+            filename = os.path.basename(image_path)
+            meta = self._meta[image_path]
+            if meta[2] is None:
+                values = (filename, "加载中...", format_file_size(meta[0]))
+                pending.append((str(i), image_path))
+            else:
+                values = (filename, f"{meta[2]}×{meta[3]}", format_file_size(meta[0]))
+            self.image_tree.insert('', 'end', iid=str(i), values=values)
+        self._rows_inserted = end
+
+        if pending:
+            self._details_active += 1
+            self._details_executor.submit(self._load_image_details_thread, generation, pending)
+            if self._details_active == 1:
+                self.parent_frame.after(_DETAILS_POLL_INTERVAL, self._drain_details)
+
+        if end < len(self.image_files):
+            self.parent_frame.after_idle(self._insert_rows, generation)
+
+    def _load_image_details_thread(self, generation: int, items: List[tuple]):
+        """后台加载图片详细信息
+
+        Args:
+            generation: 启动时的批次号，列表已重建时停止加载
+            items: (列表项ID, 图片路径) 列表
+        """
+        # 界面更新按批提交（每50项或每50毫秒），避免每个文件各唤醒一次主循环
+        batch = []
+        last_flush = time.monotonic()
+
+        try:
+            for item_id, image_path in items:
+                if generation != self._details_generation:
+                    return
+
+                try:
+                    meta = self._meta.get(image_path)
+                    if meta is None:
+                        st = os.stat(image_path)
+                        meta = (st.st_size, st.st_mtime, None, None)
+
+                    # 读取文件头获取尺寸（不解码像素）
+                    if meta[2] is None:
+                        width, height = get_image_size(image_path)
+                        meta = (meta[0], meta[1], width, height)
+                        self._meta[image_path] = meta
+
+                    batch.append((item_id, f"{meta[2]}×{meta[3]}", format_file_size(meta[0])))
+
+                except Exception as e:
+                    self.logger.error(f"读取图片信息失败 {image_path}: {e}")
+                    batch.append((item_id, "未知", "未知"))
+
+                if len(batch) >= _DETAILS_BATCH_SIZE or time.monotonic() - last_flush >= _DETAILS_BATCH_INTERVAL:
+                    # 更新界面需在主线程执行：交给 _drain_details 取出
+                    self._details_queue.put((generation, batch, False))
+                    batch = []
+                    last_flush = time.monotonic()
+        finally:
+            # 结束标记（附带剩余的结果），列表已重建而提前返回时同样发出
+            self._details_queue.put((generation, batch, True))
+
+    def _drain_details(self):
+        """主线程：取出后台加载的图片信息并更新列表，加载任务全部结束后停止检查"""
+        try:
+            while True:
+                generation, batch, done = self._details_queue.get_nowait()
+                if done:
+                    self._details_active -= 1
+                if batch:
+                    self._update_tree_items(generation, batch)
+        except queue.Empty:
+            pass
+
+        if self._details_active > 0:
+            self.parent_frame.after(_DETAILS_POLL_INTERVAL, self._drain_details)
+
+    def _update_tree_items(self, generation: int, batch: List[tuple]):
+        """批量更新列表项
+
+        Args:
+            generation: 信息加载线程的批次号，列表已重建时忽略
+            batch: (列表项ID, 尺寸文本, 文件大小文本) 列表
+        """
+        if generation != self._details_generation:
+            return
+        for item_id, size_text, file_size in batch:
+            if self.image_tree.exists(item_id):
+                current_values = self.image_tree.item(item_id)['values']
+                if current_values:
+                    self.image_tree.item(item_id, values=(current_values[0], size_text, file_size))
 
     def on_tree_select(self, event):
         """树形控件选择事件"""
@@ -352,18 +718,41 @@ class WatermarkTool:
 
         try:
             image_path = self.image_files[index]
-            image = Image.open(image_path)
-            image = ImageOps.exif_transpose(image)
-            
+
             # 简单预览原图，或者如果性能允许，预览带水印效果（这里先预览原图+提示）
             # 计算缩放
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
-            
-            if canvas_width > 1 and canvas_height > 1:
-                image.thumbnail((canvas_width - 10, canvas_height - 10), Image.Resampling.LANCZOS)
-                
-            photo = ImageTk.PhotoImage(image)
+
+            # 画布尺寸按10像素取整，窗口微小变化时仍可命中缓存
+            mtime = self._meta.get(image_path, (None, None))[1]
+            key = (image_path, mtime, canvas_width // 10 * 10, canvas_height // 10 * 10)
+            photo = self._preview_cache.get(key)
+            if photo is not None:
+                self._preview_cache.move_to_end(key)
+            else:
+                box = (canvas_width - 10, canvas_height - 10) if canvas_width > 1 and canvas_height > 1 else None
+
+                # 转换为PhotoImage后立即关闭文件，不占用文件句柄
+                with Image.open(image_path) as image:
+                    if box is not None:
+                        # JPEG在DCT域按1/2~1/8缩小解码，不完整解码大图（其他格式无影响）；
+                        # 需在方向转换前调用，旋转90°的图片按交换后的宽高计算
+                        draft_box = box[::-1] if image.getexif().get(0x0112, 1) in (5, 6, 7, 8) else box
+                        image.draft('RGB', (draft_box[0] * 2, draft_box[1] * 2))
+
+                    # 原地转换方向，方向正常时不复制图片
+                    ImageOps.exif_transpose(image, in_place=True)
+                    if box is not None:
+                        # 预览图很小，BILINEAR 与 LANCZOS 肉眼无差别且更快（保存的水印图片不受影响）
+                        image.thumbnail(box, Image.Resampling.BILINEAR)
+
+                    photo = ImageTk.PhotoImage(image)
+
+                self._preview_cache[key] = photo
+                if len(self._preview_cache) > self._preview_cache_max:
+                    self._preview_cache.popitem(last=False)
+
             self.preview_canvas.delete('all')
             self.preview_canvas.create_image(canvas_width//2, canvas_height//2, image=photo)
             self.preview_canvas.image = photo
@@ -385,9 +774,7 @@ class WatermarkTool:
 
     def get_contrast_color(self, rgb):
         """获取对比色"""
-        # 计算亮度
-        luminance = 0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2]
-        return 'white' if luminance < 128 else 'black'
+        return 'white' if _is_dark(rgb) else 'black'
 
     def choose_color(self):
         """选择颜色"""
@@ -424,7 +811,16 @@ class WatermarkTool:
         if not folder_path or not os.path.isdir(folder_path):
             return
 
-        self.image_files = get_image_files(folder_path)
+        # 扫描目录时一并取得文件大小和修改时间（每个文件只 stat 一次），
+        # 据此校验缓存，未变化的图片无需重新读取尺寸
+        files_info = get_image_files_info(folder_path)
+        for image_path, file_size, mtime in files_info:
+            meta = self._meta.get(image_path)
+            if meta is None or meta[1] != mtime:
+                self._meta[image_path] = (file_size, mtime, None, None)
+
+        self.image_files = [info[0] for info in files_info]
+        self.update_image_list()
         self.update_file_info()
 
         if self.image_files:
@@ -432,13 +828,13 @@ class WatermarkTool:
                 'type': 'status',
                 'data': f"已加载 {len(self.image_files)} 个图片文件"
             })
-            self.update_image_list()
 
     def update_file_info(self):
         """更新文件信息"""
         count = len(self.image_files)
         if count > 0:
-            total_size = sum(os.path.getsize(f) for f in self.image_files if os.path.exists(f))
+            # 使用扫描目录时取得的文件大小，无需再逐个 stat
+            total_size = sum(self._meta[f][0] for f in self.image_files)
             size_text = format_file_size(total_size)
             self.file_count_label.config(text=f"找到 {count} 个图片文件 (总大小: {size_text})")
         else:
@@ -472,9 +868,8 @@ class WatermarkTool:
     def show_watermark_preview(self, image_path):
         """显示水印预览窗口"""
         try:
-            # 加载图片
-            image = Image.open(image_path)
-            image = ImageOps.exif_transpose(image)
+            # 加载图片（添加水印会修改图片，使用缓存图片的副本）
+            image = self._get_transposed(image_path).copy()
 
             # 处理水印文本
             text = self.process_dynamic_text(self.watermark_text.get(), image)
@@ -489,142 +884,51 @@ class WatermarkTool:
             self.logger.error(f"创建预览失败: {e}")
             raise
 
+    def _get_transposed(self, image_path):
+        """获取已按EXIF方向转换并解码的图片（带缓存，调用方不得修改返回的图片）"""
+        mtime = self._meta.get(image_path, (None, None))[1]
+        key = (image_path, mtime)
+        image = self._image_cache.get(key)
+        if image is not None:
+            self._image_cache.move_to_end(key)
+            return image
+
+        with Image.open(image_path) as image:
+            ImageOps.exif_transpose(image, in_place=True)
+            image.load()
+
+        self._image_cache[key] = image
+        if len(self._image_cache) > self._image_cache_max:
+            self._image_cache.popitem(last=False)
+        return image
+
+    def get_watermark_params(self):
+        """读取当前水印参数（需在主线程调用）
+
+        Returns:
+            不含Tk变量的参数字典，可传入后台线程或子进程
+        """
+        return {
+            'font_size': self.font_size.get(),
+            'opacity': self.opacity.get(),
+            'color': list(self.watermark_color),
+            'position': self.position_var.get(),
+            'multi_size': self.multi_size_var.get(),
+            'high_contrast': self.high_contrast_var.get(),
+            'jpeg_quality': self.jpeg_quality,
+            'png_compress_level': self.png_compress_level,
+            # 未找到字体文件时为默认字体对象，不能传入子进程，以None表示（使用默认字体）
+            'font_chinese': self.font_chinese if isinstance(self.font_chinese, str) else None,
+            'font_english': self.font_english if isinstance(self.font_english, str) else None,
+        }
+
     def process_dynamic_text(self, text, image):
         """处理动态文本占位符"""
-        if "{exif_date}" in text:
-            exif_date = get_exif_datetime(image)
-            replace_text = exif_date if exif_date else "N/A"
-            text = text.replace("{exif_date}", replace_text)
-        return text
+        return _process_dynamic_text(text, image)
 
     def add_watermark_to_image(self, image, text):
         """为图片添加水印"""
-        # 转换为RGBA
-        if image.mode != 'RGBA':
-            image = image.convert('RGBA')
-
-        # 创建水印层
-        watermark = Image.new('RGBA', image.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(watermark)
-
-        # 计算字体大小
-        if self.multi_size_var.get():
-            font_size = self.calculate_adaptive_font_size(text, image.size)
-        else:
-            font_size = self.font_size.get()
-
-        # 获取字体
-        font = self.get_font(text, font_size)
-
-        # 计算文本尺寸
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        # 计算位置
-        x, y = self.calculate_position(image.size, (text_width, text_height))
-
-        # 确定颜色
-        color = self.watermark_color
-        if self.high_contrast_var.get():
-            color = self.calculate_contrast_color_for_region(image, x, y, text_width, text_height)
-
-        # 绘制水印
-        opacity_value = int(self.opacity.get() * 255 / 100)
-        fill_color = (*color, opacity_value)
-
-        draw.text((x, y), text, font=font, fill=fill_color)
-
-        # 合成图片
-        result = Image.alpha_composite(image, watermark)
-        return result
-
-    def calculate_adaptive_font_size(self, text, image_size):
-        """计算自适应字体大小"""
-        img_w, img_h = image_size
-        base_size = self.font_size.get()
-
-        # 目标宽度为图片宽度的80%
-        target_width = img_w * 0.8
-        min_size = max(10, int(min(img_w, img_h) * 0.02))
-        max_size = int(min(img_w, img_h) * 0.3)
-
-        # 二分查找最佳字体大小
-        best_size = min_size
-        low, high = min_size, max_size
-
-        # Create a single temporary image and draw object for measurement
-        temp_img = Image.new('RGB', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-
-        for _ in range(10):  # 最多迭代10次
-            if low > high:
-                break
-
-            mid = (low + high) // 2
-            font = self.get_font(text, mid)
-
-            bbox = temp_draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-
-            if text_width <= target_width:
-                best_size = mid
-                low = mid + 1
-            else:
-                high = mid - 1
-
-        return max(min_size, min(best_size, max_size))
-
-    def get_font(self, text, size):
-        """获取合适的字体"""
-        try:
-            if contains_chinese(text):
-                return ImageFont.truetype(self.font_chinese, max(1, size))
-            else:
-                return ImageFont.truetype(self.font_english, max(1, size))
-        except:
-            return ImageFont.load_default()
-
-    def calculate_position(self, image_size, text_size):
-        """计算水印位置"""
-        img_w, img_h = image_size
-        text_w, text_h = text_size
-        margin = 10
-
-        position = self.position_var.get()
-        if position == "左上角":
-            return margin, margin
-        elif position == "右上角":
-            return img_w - text_w - margin, margin
-        elif position == "左下角":
-            return margin, img_h - text_h - margin
-        elif position == "右下角":
-            return img_w - text_w - margin, img_h - text_h - margin
-        elif position == "中心":
-            return (img_w - text_w) // 2, (img_h - text_h) // 2
-        else:
-            return margin, margin
-
-    def calculate_contrast_color_for_region(self, image, x, y, width, height):
-        """计算区域对比色"""
-        try:
-            # 裁剪区域
-            region = image.crop((x, y, x + width, y + height))
-            # 转换为RGB计算平均颜色
-            if region.mode != 'RGB':
-                region = region.convert('RGB')
-
-            stat = ImageStat.Stat(region)
-            mean = stat.mean
-
-            # 计算亮度
-            luminance = 0.299 * mean[0] + 0.587 * mean[1] + 0.114 * mean[2]
-
-            # 返回对比色
-            return (0, 0, 0) if luminance > 128 else (255, 255, 255)
-
-        except Exception:
-            return self.watermark_color
+        return _add_watermark(image, text, self.get_watermark_params())
 
     def show_preview_window(self, image, title):
         """显示预览窗口"""
@@ -633,9 +937,9 @@ class WatermarkTool:
         preview_window.geometry("800x600")
         preview_window.resizable(True, True)
 
-        # 调整图片大小以适应窗口
+        # 调整图片大小以适应窗口（仅用于显示，使用更快的 BILINEAR）
         max_width, max_height = 780, 580
-        image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        image.thumbnail((max_width, max_height), Image.Resampling.BILINEAR)
 
         # 转换为PhotoImage
         photo = ImageTk.PhotoImage(image)
@@ -668,16 +972,26 @@ class WatermarkTool:
         self.is_processing = True
         self.stop_requested = False
 
-        thread = threading.Thread(target=self.process_images_thread, daemon=True)
+        # 在主线程读取全部参数，后台线程与子进程不访问Tk变量
+        thread = threading.Thread(
+            target=self.process_images_thread,
+            args=(self.current_folder.get(), text, self.get_watermark_params()),
+            daemon=True
+        )
         thread.start()
 
-    def process_images_thread(self):
-        """处理图片的线程函数"""
+    def process_images_thread(self, folder_path, text, params):
+        """处理图片的线程函数
+
+        Args:
+            folder_path: 图片文件夹
+            text: 水印文本
+            params: 水印参数快照
+        """
         try:
             # 创建输出文件夹
-            output_folder = create_output_folder(self.current_folder.get(), "Watermarked_Images")
+            output_folder = create_output_folder(folder_path, "Watermarked_Images")
 
-            text = self.watermark_text.get().strip()
             total_images = len(self.image_files)
             processed_count = 0
             error_count = 0
@@ -687,43 +1001,49 @@ class WatermarkTool:
                 'data': "开始批量添加水印..."
             })
 
-            for i, image_path in enumerate(self.image_files):
-                if self.stop_requested:
-                    break
-
-                # 更新进度
-                progress = (i + 1) / total_images * 100
-                self.message_queue.put({
-                    'type': 'progress',
-                    'data': progress
-                })
-
-                filename = os.path.basename(image_path)
-                self.message_queue.put({
-                    'type': 'status',
-                    'data': f"处理图片 {i+1}/{total_images}: {filename}"
-                })
-
-                try:
-                    # 处理图片
-                    image = Image.open(image_path)
-                    image = ImageOps.exif_transpose(image)
-
-                    # 处理动态文本
-                    processed_text = self.process_dynamic_text(text, image)
-
-                    # 添加水印
-                    watermarked = self.add_watermark_to_image(image, processed_text)
-
-                    # 保存文件
-                    output_path = os.path.join(output_folder, filename)
-                    self.save_image(watermarked, output_path, image.format)
+            # 多进程并行处理，每张图片在子进程中完成读取、加水印和保存，
+            # 主线程按原顺序取回结果并更新进度
+            max_workers = min(os.cpu_count() or 1, total_images)
+            # 在途任务上限：停止时只需等待少量已提交的任务
+            window = max_workers * 2
+
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(text, params)) as executor:
+                pending = deque()
+                image_iter = iter(self.image_files)
+
+                for i in range(total_images):
+                    if self.stop_requested:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+                    # 补足在途任务，再按顺序取出下一张
+                    while len(pending) < window:
+                        next_path = next(image_iter, None)
+                        if next_path is None:
+                            break
+                        pending.append((
+                            next_path,
+                            executor.submit(_watermark_file, next_path, output_folder, text, params)
+                        ))
+
+                    image_path, future = pending.popleft()
+
+                    # 更新进度（进度与状态合并为一条消息）
+                    progress = (i + 1) / total_images * 100
+                    filename = os.path.basename(image_path)
+                    self.message_queue.put({
+                        'type': 'tick',
+                        'data': (progress, f"处理图片 {i+1}/{total_images}: {filename}")
+                    })
 
-                    processed_count += 1
+                    try:
+                        future.result()
+                        processed_count += 1
 
-                except Exception as e:
-                    error_count += 1
-                    self.logger.error(f"处理图片失败 {image_path}: {e}")
+                    except Exception as e:
+                        error_count += 1
+                        self.logger.error(f"处理图片失败 {image_path}: {e}")
 
             # 完成
             if self.stop_requested:
@@ -761,40 +1081,6 @@ class WatermarkTool:
                 'data': True
             })
 
-    def save_image(self, image, output_path, original_format):
-        """保存图片"""
-        try:
-            # Prepare format
-            save_format = original_format if original_format else 'PNG'
-            
-            # Handle JPEG specifics
-            if save_format.upper() in ('JPEG', 'JPG'):
-                # JPEG supports no alpha, convert to RGB if needed
-                if image.mode == 'RGBA':
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[-1])
-                    image = background
-                image.save(output_path, 'JPEG', quality=95)
-            
-            # Handle other formats
-            elif save_format.upper() == 'PNG':
-                image.save(output_path, 'PNG')
-            elif save_format.upper() == 'WEBP':
-                image.save(output_path, 'WEBP')
-            else:
-                # Fallback for unknown formats, try to save as is or default to PNG if it fails
-                try:
-                    image.save(output_path, save_format)
-                except:
-                    # If saving with original format fails (e.g. BMP with alpha), fall back to PNG
-                    if not output_path.lower().endswith('.png'):
-                        output_path = os.path.splitext(output_path)[0] + '.png'
-                    image.save(output_path, 'PNG')
-
-        except Exception as e:
-            self.logger.error(f"保存图片失败 {output_path}: {e}")
-            raise
-
     def stop_processing(self):
         """停止处理"""
         self.stop_requested = True
@@ -838,6 +1124,8 @@ class WatermarkTool:
             self.position_var.set(watermark_config.get('position', '中心'))
             self.multi_size_var.set(watermark_config.get('multi_size', True))
             self.high_contrast_var.set(watermark_config.get('high_contrast', True))
+            self.jpeg_quality = watermark_config.get('jpeg_quality', 92)
+            self.png_compress_level = watermark_config.get('png_compress_level', 1)
 
             # 更新颜色按钮
             self.color_button.config(
@@ -850,6 +1138,11 @@ class WatermarkTool:
         except Exception as e:
             self.logger.error(f"加载设置失败: {e}")
 
+    def close(self):
+        """关闭工具：停止加载图片信息并释放线程池"""
+        self._details_generation += 1
+        self._details_executor.shutdown(wait=False, cancel_futures=True)
+
     def save_settings(self):
         """保存设置"""
         try:
@@ -860,7 +1153,9 @@ class WatermarkTool:
                 'color': self.watermark_color,
                 'position': self.position_var.get(),
                 'multi_size': self.multi_size_var.get(),
-                'high_contrast': self.high_contrast_var.get()
+                'high_contrast': self.high_contrast_var.get(),
+                'jpeg_quality': self.jpeg_quality,
+                'png_compress_level': self.png_compress_level
             }
 
             self.config_manager.update_section('watermark', watermark_settings)
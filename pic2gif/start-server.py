@@ -8,7 +8,6 @@
 """
 
 import http.server
-import socketserver
 import webbrowser
 import os
 import sys
@@ -21,10 +20,17 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(current_dir)
 
 # 创建HTTP服务器
-Handler = http.server.SimpleHTTPRequestHandler
+class Handler(http.server.SimpleHTTPRequestHandler):
+    """静态文件请求处理器"""
+
+    def copyfile(self, source, outputfile):
+        # 文件内容由内核直接发送到套接字（sendfile），不经过Python读写缓冲；
+        # 不支持 sendfile 的平台或非文件数据（如目录列表）自动退回普通发送
+        self.connection.sendfile(source)
 
 try:
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    # 多线程服务器：浏览器并行请求页面资源时互不阻塞（请求线程为守护线程，Ctrl+C 可直接退出）
+    with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
         print(f"🚀 服务器启动成功！")
         print(f"📍 服务器地址: http://localhost:{PORT}")
         print(f"📁 服务器目录: {current_dir}")
@@ -1,10 +1,59 @@
+import io
 import os
+import re
+import queue
 import datetime
+import threading
 import img2pdf
 from tkinter import Tk, Label, Entry, Button, filedialog, messagebox, Frame, Menu
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ExifTags
 from tkinter import ttk
 
+# 预览图最大尺寸
+PREVIEW_SIZE = (150, 150)
+
+def natural_key(name):
+    """自然排序键：文件名中的数字按数值比较，img2.jpg 排在 img10.jpg 之前"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+def load_exif_thumbnail(image, max_size):
+    """读取JPEG的EXIF内嵌缩略图，没有可用的缩略图时返回None
+
+    缩略图需不小于预览尺寸，且宽高比与原图一致（部分相机会给缩略图加黑边）
+    """
+    try:
+        ifd1 = image.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset, length = ifd1.get(0x0201), ifd1.get(0x0202)
+        exif_data = image.info.get('exif')
+        if not (offset and length and exif_data):
+            return None
+
+        # 偏移量相对于TIFF头，exif数据前6字节为 "Exif\0\0"
+        thumb = Image.open(io.BytesIO(exif_data[6 + offset:6 + offset + length]))
+        thumb.load()
+    except Exception:
+        return None
+
+    if max(thumb.size) < max(max_size):
+        return None
+    if abs(thumb.width * image.height - image.width * thumb.height) > 0.02 * image.width * thumb.height:
+        return None
+    return thumb
+
+def make_preview(path, max_size):
+    """生成图片预览（可在后台线程调用）"""
+    with Image.open(path) as image:
+        # 优先使用EXIF内嵌缩略图，无需解码原图；
+        # 否则JPEG在DCT域预缩小到预览尺寸的2倍左右再解码，不完整解码大图（其他格式无影响）
+        preview = load_exif_thumbnail(image, max_size)
+        if preview is None:
+            image.draft('RGB', (max_size[0] * 2, max_size[1] * 2))
+            preview = image
+        # 预览图很小，BILINEAR 与 LANCZOS 肉眼无差别且更快
+        preview.thumbnail(max_size, Image.Resampling.BILINEAR)
+        preview.load()
+    return preview
+
 class ImageToPdfConverter(Tk):
     def __init__(self):
         super().__init__()
@@ -75,11 +124,20 @@ class ImageToPdfConverter(Tk):
         self.preview_list.bind('<<TreeviewSelect>>', self.show_preview)
         
         self.current_images = []
+        # 列表项ID -> 在 current_images 中的位置（移动、删除时同步更新，无需 Treeview.index 逐项查找）
+        self.item_index = {}
         
         # 创建右键菜单
         self.context_menu = Menu(self, tearoff=0)
         self.context_menu.add_command(label="删除", command=self.remove_selected)
         self.preview_list.bind("<Button-3>", self.show_context_menu)
+        
+        # 预览图缓存：图片路径 -> PhotoImage
+        # 选择文件夹后由后台线程生成全部缩略图，经队列交给主线程创建 PhotoImage
+        self.thumb_cache = {}
+        self.thumb_queue = queue.Queue()
+        self.thumb_generation = 0
+        self.after(50, self.drain_thumbs)
     
     def move_up(self):
         """将选中项目向上移动"""
@@ -88,11 +146,12 @@ class ImageToPdfConverter(Tk):
             return
             
         item = selection[0]
-        idx = self.preview_list.index(item)
+        idx = self.item_index[item]
         if idx > 0:
             # 更新列表显示
             prev = self.preview_list.prev(item)
             self.preview_list.move(item, '', idx - 1)
+            self.item_index[item], self.item_index[prev] = idx - 1, idx
             # 更新图片列表
             self.current_images[idx], self.current_images[idx-1] = \
                 self.current_images[idx-1], self.current_images[idx]
@@ -106,11 +165,12 @@ class ImageToPdfConverter(Tk):
             return
             
         item = selection[0]
-        idx = self.preview_list.index(item)
+        idx = self.item_index[item]
         if idx < len(self.current_images) - 1:
             # 更新列表显示
             next = self.preview_list.next(item)
             self.preview_list.move(item, '', idx + 1)
+            self.item_index[item], self.item_index[next] = idx + 1, idx
             # 更新图片列表
             self.current_images[idx], self.current_images[idx+1] = \
                 self.current_images[idx+1], self.current_images[idx]
@@ -131,15 +191,20 @@ class ImageToPdfConverter(Tk):
             return
             
         item = selection[0]
-        idx = self.preview_list.index(item)
+        idx = self.item_index.pop(item)
         # 从列表和数据中删除
         self.preview_list.delete(item)
         del self.current_images[idx]
         
+        # 后面的项目位置前移一位
+        children = self.preview_list.get_children()
+        for later in children[idx:]:
+            self.item_index[later] -= 1
+        
         # 如果还有其他项目，选中下一个
-        if self.preview_list.get_children():
+        if children:
             next_idx = min(idx, len(self.current_images) - 1)
-            next_item = self.preview_list.get_children()[next_idx]
+            next_item = children[next_idx]
             self.preview_list.selection_set(next_item)
             self.show_preview(None)
     
@@ -155,12 +220,50 @@ class ImageToPdfConverter(Tk):
         """更新预览列表"""
         self.preview_list.delete(*self.preview_list.get_children())
         self.current_images = []
+        self.item_index = {}
+        
+        # os.scandir 枚举目录时已带有文件类型，无需逐个 stat
+        with os.scandir(folder_path) as entries:
+            images = [entry for entry in entries
+                      if entry.name.lower().endswith(('.jpg', '.jpeg', '.png')) and entry.is_file()]
+        images.sort(key=lambda entry: natural_key(entry.name))
         
-        for f in os.listdir(folder_path):
-            if f.lower().endswith(('.jpg', '.jpeg', '.png')):
-                full_path = os.path.join(folder_path, f)
-                self.current_images.append(full_path)
-                self.preview_list.insert('', 'end', values=(f,))
+        for entry in images:
+            item = self.preview_list.insert('', 'end', values=(entry.name,))
+            self.item_index[item] = len(self.current_images)
+            self.current_images.append(entry.path)
+        
+        # 后台生成缩略图，再次选择文件夹时旧线程自动停止
+        self.thumb_cache = {}
+        self.thumb_generation += 1
+        threading.Thread(
+            target=self.load_thumbnails,
+            args=(self.thumb_generation, list(self.current_images)),
+            daemon=True
+        ).start()
+    
+    def load_thumbnails(self, generation, paths):
+        """后台线程：依次生成缩略图"""
+        for path in paths:
+            if generation != self.thumb_generation:
+                return
+            try:
+                preview = make_preview(path, PREVIEW_SIZE)
+            except Exception:
+                # 无法读取的图片在选中预览时再提示错误
+                continue
+            self.thumb_queue.put((generation, path, preview))
+    
+    def drain_thumbs(self):
+        """主线程：将后台生成的缩略图加入缓存"""
+        try:
+            while True:
+                generation, path, preview = self.thumb_queue.get_nowait()
+                if generation == self.thumb_generation and path not in self.thumb_cache:
+                    self.thumb_cache[path] = ImageTk.PhotoImage(preview)
+        except queue.Empty:
+            pass
+        self.after(50, self.drain_thumbs)
     
     def show_preview(self, event):
         """显示选中图片的预览"""
@@ -168,15 +271,15 @@ class ImageToPdfConverter(Tk):
         if not selection:
             return
             
-        index = self.preview_list.index(selection[0])
+        index = self.item_index[selection[0]]
         if index < len(self.current_images):
             try:
-                # 加载并调整图片大小
-                image = Image.open(self.current_images[index])
-                # 计算缩放比例，限制预览大小
-                max_size = (150, 150)
-                image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
+                path = self.current_images[index]
+                photo = self.thumb_cache.get(path)
+                if photo is None:
+                    # 后台线程尚未生成到这张图片时当场生成
+                    photo = ImageTk.PhotoImage(make_preview(path, PREVIEW_SIZE))
+                    self.thumb_cache[path] = photo
                 
                 self.image_preview.configure(image=photo)
                 self.image_preview.image = photo  # 保持引用
@@ -207,8 +310,9 @@ class ImageToPdfConverter(Tk):
             output_path = os.path.join(folder_path, pdf_file_name)
             
             # 使用 img2pdf 生成 PDF 文件，不压缩图片
+            # 直接写入文件，不先拼出整个PDF的字节串
             with open(output_path, "wb") as f:
-                f.write(img2pdf.convert(self.current_images))
+                img2pdf.convert(self.current_images, outputstream=f)
             
             messagebox.showinfo("完成", f"PDF 文件已生成！\n保存路径: {output_path}")
         except Exception as e:
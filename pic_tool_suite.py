@@ -8,6 +8,7 @@
 import os
 import sys
 import json
+import importlib
 import logging
 import threading
 import queue
@@ -23,14 +24,36 @@ from PIL import Image, ImageTk
 try:
     from config import ConfigManager
     from utils import setup_logging, get_resource_path
-    from modules.gif_converter import GifConverter
-    from modules.pdf_converter import PdfConverter
-    from modules.watermark_tool import WatermarkTool
 except ImportError as e:
     print(f"导入模块失败: {e}")
     print("请确保所有必要的文件都在正确的位置")
     sys.exit(1)
 
+# 各工具所在模块与类名（首次切换到该工具时才导入模块并创建界面）
+_TOOL_CLASSES = {
+    'watermark': ('modules.watermark_tool', 'WatermarkTool'),
+    'gif': ('modules.gif_converter', 'GifConverter'),
+    'pdf': ('modules.pdf_converter', 'PdfConverter'),
+}
+
+# 消息队列检查间隔（毫秒）：有消息时快速连续检查，空闲时放慢，减少主循环空转
+_MESSAGE_POLL_BUSY = 20
+_MESSAGE_POLL_IDLE = 200
+
+# 状态栏与进度条的最短刷新间隔（毫秒），期间的多次更新只显示最后一次
+_STATUS_FLUSH_INTERVAL = 33
+
+# 自定义控件样式
+_STYLE_SPEC = {
+    'Title.TLabel': {'font': ('Microsoft YaHei', 12, 'bold')},
+    'Heading.TLabel': {'font': ('Microsoft YaHei', 10, 'bold')},
+    'Info.TLabel': {'font': ('Microsoft YaHei', 9)},
+    'Primary.TButton': {'font': ('Microsoft YaHei', 9)},
+    'Success.TButton': {'font': ('Microsoft YaHei', 9), 'background': '#4CAF50'},
+    'Warning.TButton': {'font': ('Microsoft YaHei', 9), 'background': '#FF9800'},
+    'Danger.TButton': {'font': ('Microsoft YaHei', 9), 'background': '#F44336'},
+}
+
 class PicToolSuite:
     """图片处理工具套件主应用"""
 
@@ -63,22 +86,19 @@ class PicToolSuite:
         """设置UI样式"""
         style = ttk.Style()
 
-        # 配置主题
+        # 可用主题（设置对话框直接使用，无需再次查询）
+        self._available_themes = sorted(style.theme_names())
+
+        # 配置主题（已是当前主题时不再切换）
         current_theme = self.config_manager.get('app.theme', 'clam')
-        try:
+        if current_theme not in self._available_themes:
+            current_theme = 'clam'
+        if style.theme_use() != current_theme:
             style.theme_use(current_theme)
-        except tk.TclError:
-            style.theme_use('clam')
 
         # 自定义样式
-        style.configure('Title.TLabel', font=('Microsoft YaHei', 12, 'bold'))
-        style.configure('Heading.TLabel', font=('Microsoft YaHei', 10, 'bold'))
-        style.configure('Info.TLabel', font=('Microsoft YaHei', 9))
-
-        style.configure('Primary.TButton', font=('Microsoft YaHei', 9))
-        style.configure('Success.TButton', font=('Microsoft YaHei', 9), background='#4CAF50')
-        style.configure('Warning.TButton', font=('Microsoft YaHei', 9), background='#FF9800')
-        style.configure('Danger.TButton', font=('Microsoft YaHei', 9), background='#F44336')
+        for style_name, options in _STYLE_SPEC.items():
+            style.configure(style_name, **options)
 
     def setup_logging(self):
         """设置日志系统"""
@@ -98,6 +118,11 @@ class PicToolSuite:
         self.status_text = tk.StringVar(value="就绪")
         self.progress_var = tk.DoubleVar()
 
+        # 待显示的状态文本与进度（None表示无更新）
+        self._pending_status = None
+        self._pending_progress = None
+        self._flush_scheduled = False
+
         # 工具实例
         self.tools = {}
 
@@ -222,33 +247,31 @@ class PicToolSuite:
         self.progress_label.pack(side='right', padx=(5, 0))
 
     def initialize_tools(self):
-        """初始化工具"""
-        try:
-            # 初始化水印工具
-            self.tools['watermark'] = WatermarkTool(
-                self.tool_frames['watermark'],
-                self.config_manager,
-                self.message_queue,
-                self.update_status
-            )
+        """初始化工具（启动时只创建当前工具，其余工具在首次切换到时创建）"""
+        self.ensure_tool(self.current_tool.get())
 
-            # 初始化GIF工具
-            self.tools['gif'] = GifConverter(
-                self.tool_frames['gif'],
-                self.config_manager,
-                self.message_queue,
-                self.update_status
-            )
+    def ensure_tool(self, tool_id):
+        """确保工具已创建"""
+        if tool_id in self.tools:
+            return
 
-            # 初始化PDF工具
-            self.tools['pdf'] = PdfConverter(
-                self.tool_frames['pdf'],
+        try:
+            # 创建界面期间主循环无法重绘，先显示加载提示
+            self.update_status(f"正在加载: {self.get_tool_name(tool_id)}...")
+            self.flush_status()
+            self.root.update_idletasks()
+
+            module_name, class_name = _TOOL_CLASSES[tool_id]
+            tool_class = getattr(importlib.import_module(module_name), class_name)
+            self.tools[tool_id] = tool_class(
+                self.tool_frames[tool_id],
                 self.config_manager,
                 self.message_queue,
                 self.update_status
             )
 
-            self.logger.info("所有工具初始化完成")
+            self.logger.info(f"工具初始化完成: {tool_id}")
+            self.update_status("就绪")
 
         except Exception as e:
             self.logger.error(f"工具初始化失败: {e}")
@@ -257,6 +280,7 @@ class PicToolSuite:
     def on_tool_changed(self):
         """工具选择改变事件"""
         tool_id = self.current_tool.get()
+        self.ensure_tool(tool_id)
 
         # 切换到对应的标签页
         for i, tab_id in enumerate(['watermark', 'gif', 'pdf']):
@@ -277,6 +301,7 @@ class PicToolSuite:
         }
 
         tool_id = tool_mapping.get(current_tab, "watermark")
+        self.ensure_tool(tool_id)
         self.current_tool.set(tool_id)
 
     def get_tool_name(self, tool_id):
@@ -290,26 +315,53 @@ class PicToolSuite:
 
     def update_status(self, message):
         """更新状态栏"""
-        self.status_text.set(message)
-        self.root.update_idletasks()
+        self._pending_status = message
+        self.schedule_status_flush()
 
     def update_progress(self, value):
         """更新进度条"""
-        self.progress_var.set(value)
-        self.progress_label.config(text=f"{int(value)}%")
-        self.root.update_idletasks()
-
-    def check_message_queue(self):
-        """检查消息队列"""
+        self._pending_progress = value
+        self.schedule_status_flush()
+
+    def schedule_status_flush(self):
+        """安排刷新状态栏（处理大量图片时每张图片都会更新，合并后再重绘）"""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(_STATUS_FLUSH_INTERVAL, self.flush_status)
+
+    def flush_status(self):
+        """显示最新的状态文本与进度"""
+        self._flush_scheduled = False
+
+        if self._pending_status is not None:
+            self.status_text.set(self._pending_status)
+            self._pending_status = None
+
+        if self._pending_progress is not None:
+            self.progress_var.set(self._pending_progress)
+            self.progress_label.config(text=f"{int(self._pending_progress)}%")
+            self._pending_progress = None
+
+    def drain_message_queue(self) -> bool:
+        """处理消息队列中的全部消息，返回是否处理了消息"""
+        handled = False
         try:
             while True:
                 message = self.message_queue.get_nowait()
+                handled = True
                 self.handle_message(message)
         except queue.Empty:
             pass
+        return handled
+
+    def check_message_queue(self):
+        """检查消息队列（后台线程只负责入队，界面更新统一在主线程进行）"""
+        handled = False
+        try:
+            handled = self.drain_message_queue()
         finally:
-            # 继续检查队列
-            self.root.after(100, self.check_message_queue)
+            interval = _MESSAGE_POLL_BUSY if handled else _MESSAGE_POLL_IDLE
+            self.root.after(interval, self.check_message_queue)
 
     def handle_message(self, message):
         """处理消息"""
@@ -323,6 +375,11 @@ class PicToolSuite:
             self.update_status(msg_data)
         elif msg_type == 'progress':
             self.update_progress(msg_data)
+        elif msg_type == 'tick':
+            # 处理循环每次迭代的 (进度, 状态文本)
+            progress, status = msg_data
+            self.update_progress(progress)
+            self.update_status(status)
         elif msg_type == 'error':
             messagebox.showerror("错误", msg_data)
         elif msg_type == 'info':
@@ -334,6 +391,11 @@ class PicToolSuite:
             for tool in self.tools.values():
                 if hasattr(tool, 'enable_controls'):
                     tool.enable_controls(msg_data)
+        elif msg_type == 'thumb_ready':
+            # 后台生成的缩略图交给对应工具显示
+            for tool in self.tools.values():
+                if hasattr(tool, 'on_thumbnail_ready'):
+                    tool.on_thumbnail_ready(msg_data)
 
     def load_settings(self):
         """加载设置"""
@@ -376,12 +438,10 @@ class PicToolSuite:
         current_theme = self.config_manager.get('app.theme', 'clam')
         theme_var = tk.StringVar(value=current_theme)
         
-        # 获取可用主题
-        available_themes = ttk.Style().theme_names()
         theme_combo = ttk.Combobox(
             theme_frame, 
             textvariable=theme_var, 
-            values=sorted(list(available_themes)),
+            values=self._available_themes,
             state='readonly'
         )
         theme_combo.pack(side='left', padx=(10, 0), fill='x', expand=True)
@@ -469,13 +529,20 @@ class PicToolSuite:
     def on_closing(self):
         """窗口关闭事件"""
         self.save_settings()
+        # 通知各工具释放后台线程池等资源
+        for tool in self.tools.values():
+            if hasattr(tool, 'close'):
+                try:
+                    tool.close()
+                except Exception as e:
+                    self.logger.error(f"关闭工具失败: {e}")
         self.logger.info("程序正常退出")
         self.root.destroy()
 
     def run(self):
         """运行应用"""
         # 启动消息队列检查
-        self.root.after(100, self.check_message_queue)
+        self.root.after(_MESSAGE_POLL_IDLE, self.check_message_queue)
 
         # 绑定关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
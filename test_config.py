@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置管理测试
+"""
+
+import pytest
+
+import config
+
+_SAMPLE = {
+    "pdf": {"quality": 95, "page_size": "A4", "downscale": False},
+    "watermark": {"text": "水印", "color": "#FFFFFF", "multi_size": [0.5, 1.0]},
+    "paths": {"last_folder": None},
+}
+
+def test_json_dumps_same_output_with_and_without_orjson(monkeypatch):
+    """orjson与标准库json写出的配置文件完全一致"""
+    pytest.importorskip('orjson')
+    fast = config._json_dumps(_SAMPLE)
+
+    monkeypatch.setattr(config, 'orjson', None)
+    plain = config._json_dumps(_SAMPLE)
+
+    assert fast == plain
+    assert plain.startswith(b'{\n  "pdf": {\n    "quality": 95')
+
+def test_config_stays_json_by_default(tmp_path):
+    """即使安装了msgpack，默认配置文件仍以JSON存储"""
+    config_file = str(tmp_path / 'pic_tool_config.json')
+    manager = config.ConfigManager(config_file)
+    manager.load_settings()
+    manager.save_settings()
+
+    assert manager.config_file == config_file
+    assert (tmp_path / 'pic_tool_config.json').read_bytes().startswith(b'{')
+    assert not (tmp_path / 'pic_tool_config.msgpack').exists()
+
+def test_msgpack_storage_is_opt_in_and_migrates_json(tmp_path):
+    """配置文件名以 .msgpack 结尾时使用MessagePack，并从同名JSON迁移"""
+    msgpack = pytest.importorskip('msgpack')
+    json_manager = config.ConfigManager(str(tmp_path / 'pic_tool_config.json'))
+    json_manager.load_settings()
+    json_manager.update_section('pdf', {'quality': 80})
+    json_manager.save_settings()
+
+    manager = config.ConfigManager(str(tmp_path / 'pic_tool_config.msgpack'))
+
+    assert manager.load_settings()
+    assert manager.get_section('pdf')['quality'] == 80
+    data = msgpack.unpackb((tmp_path / 'pic_tool_config.msgpack').read_bytes(), raw=False)
+    assert data['pdf']['quality'] == 80
+
+def test_merge_configs_keeps_new_defaults_and_nested_values():
+    manager = config.ConfigManager()
+    default = {"pdf": {"quality": 95, "margin": 10}, "theme": "light"}
+    loaded = {"pdf": {"quality": 80}, "theme": "dark", "extra": {"a": 1}}
+
+    merged = manager.merge_configs(default, loaded)
+
+    assert merged == {"pdf": {"quality": 80, "margin": 10}, "theme": "dark", "extra": {"a": 1}}
+    # 默认配置不被修改
+    assert default == {"pdf": {"quality": 95, "margin": 10}, "theme": "light"}
+
+def test_get_section_is_read_only_view(tmp_path):
+    manager = config.ConfigManager(str(tmp_path / 'pic_tool_config.json'))
+    manager.load_settings()
+
+    section = manager.get_section('pdf')
+    with pytest.raises(TypeError):
+        section['quality'] = 1
+
+    manager.update_section('pdf', {'quality': 70})
+    assert manager.get_section('pdf')['quality'] == 70
+    assert manager.get('pdf.quality') == 70
+    assert dict(manager.get_section('missing')) == {}
+
+    mutable = manager.get_section_mutable('pdf')
+    mutable['quality'] = 1
+    assert manager.get('pdf.quality') == 70
+
+_INVALID_CONFIGS = [
+    ('watermark', 'jpeg_quality', 500),
+    ('watermark', 'jpeg_quality', 0),
+    ('watermark', 'jpeg_quality', 90.5),
+    ('watermark', 'png_compress_level', 10),
+    ('watermark', 'png_compress_level', -1),
+    ('watermark', 'font_size', 0),
+    ('watermark', 'font_size', True),
+    ('watermark', 'opacity', 101),
+    ('gif', 'delay', -5),
+    ('pdf', 'page_size', 'B5'),
+    ('pdf', 'downscale', 'yes'),
+]
+
+@pytest.mark.parametrize('section, key, value', _INVALID_CONFIGS)
+def test_schema_and_manual_validators_agree(section, key, value):
+    """是否安装fastjsonschema，校验结果都相同"""
+    pytest.importorskip('fastjsonschema')
+    manager = config.ConfigManager()
+    manager.config = config._copy_defaults()
+    assert manager._validate_config_schema()
+    assert manager._validate_config_manual()
+
+    manager.config[section][key] = value
+
+    assert not manager._validate_config_schema()
+    assert not manager._validate_config_manual()
+
+def test_validators_accept_missing_optional_keys():
+    pytest.importorskip('fastjsonschema')
+    manager = config.ConfigManager()
+    manager.config = config._copy_defaults()
+    for key in ('jpeg_quality', 'png_compress_level'):
+        del manager.config['watermark'][key]
+    del manager.config['pdf']['downscale']
+
+    assert manager._validate_config_schema()
+    assert manager._validate_config_manual()
+
+def test_get_returns_copies_of_containers(tmp_path):
+    """修改 get 返回的容器不影响配置，也不会使取值缓存过期"""
+    manager = config.ConfigManager(str(tmp_path / 'pic_tool_config.json'))
+    manager.load_settings()
+    assert manager.get('gif.delay') == 500
+
+    manager.get('gif')['delay'] = 1
+
+    assert manager.get('gif.delay') == 500
+    assert manager.get('gif')['delay'] == 500
+    assert manager.get_section('gif')['delay'] == 500
+
+    manager.update_section('gif', {'delay': 200})
+    assert manager.get('gif.delay') == manager.get_cached('gif.delay') == 200
+
+def test_validate_config_sees_direct_changes():
+    manager = config.ConfigManager()
+    manager.config = config._copy_defaults()
+    assert manager.validate_config()
+
+    manager.config['gif']['delay'] = -5
+
+    assert not manager.validate_config()
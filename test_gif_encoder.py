@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GIF编码器测试
+"""
+
+import io
+import os
+
+from PIL import Image
+
+from modules.gif_converter import SimpleGifEncoder, _palette_sample_indices
+
+SIZE = (32, 32)
+
+def _gradient_frames(count):
+    """颜色逐帧渐变的纯色帧"""
+    return [Image.new('RGB', SIZE, (10 * i, 0, 200 - 5 * i)) for i in range(count)]
+
+def _decode(data):
+    """解码GIF，返回各帧中心像素的RGB颜色"""
+    colors = []
+    with Image.open(io.BytesIO(data)) as image:
+        for i in range(image.n_frames):
+            image.seek(i)
+            colors.append(image.convert('RGB').getpixel((SIZE[0] // 2, SIZE[1] // 2)))
+    return colors
+
+def _stream(frames, palette_frames=None):
+    encoder = SimpleGifEncoder(backend='direct')
+    encoder.setSize(*SIZE)
+    output = io.BytesIO()
+    encoder.begin(output, palette_frames=palette_frames)
+    for frame in frames:
+        encoder.add_frame_streaming(frame)
+    encoder.finalize()
+    return output.getvalue()
+
+def test_streaming_keeps_colours_missing_from_global_palette():
+    """调色板采样帧之后才出现的颜色不能被映射成其他颜色"""
+    frames = _gradient_frames(20)
+    frames[17] = Image.new('RGB', SIZE, (0, 255, 0))
+
+    colors = _decode(_stream(frames))
+
+    assert len(colors) == 20
+    assert colors[17] == (0, 255, 0)
+
+def test_streaming_with_sampled_palette_frames():
+    """从全部帧中均匀采样计算调色板时，各帧颜色基本不变"""
+    frames = _gradient_frames(40)
+    samples = [frames[i] for i in _palette_sample_indices(len(frames))]
+
+    colors = _decode(_stream(frames, palette_frames=samples))
+
+    for expected, actual in zip((frame.getpixel((0, 0)) for frame in frames), colors):
+        assert max(abs(a - b) for a, b in zip(expected, actual)) <= 16
+
+def test_palette_sample_indices():
+    assert _palette_sample_indices(0) == []
+    assert _palette_sample_indices(3) == [0, 1, 2]
+
+    indices = _palette_sample_indices(100)
+    assert len(indices) == 16
+    assert indices[0] == 0 and indices[-1] == 99
+
+def test_abort_removes_gifsicle_temp_dir():
+    """未调用 finalize 时 abort 关闭并删除临时文件"""
+    encoder = SimpleGifEncoder(backend='gifsicle')
+    encoder.setSize(*SIZE)
+    encoder.begin(io.BytesIO())
+    for frame in _gradient_frames(3):
+        encoder.add_frame_streaming(frame)
+    tmp_dir, out = encoder._tmp_dir.name, encoder._out
+
+    encoder.abort()
+
+    assert out.closed
+    assert not os.path.exists(tmp_dir)
+    assert encoder._tmp_dir is None
+    # 重复调用无副作用
+    encoder.abort()
+
+def test_two_colour_frames_use_minimum_lzw_code_size():
+    """只有两种颜色时颜色表为1位，LZW最小码长按规范取2"""
+    encoder = SimpleGifEncoder(backend='direct')
+    encoder.setSize(*SIZE)
+    frame = Image.new('RGB', SIZE, (0, 0, 0))
+    frame.paste((255, 255, 255), (0, 0, SIZE[0] // 2, SIZE[1]))
+    encoder.addFrame(frame)
+    data = encoder.encode_to_bytes()
+
+    assert encoder._palette_bits == 1
+    assert encoder._lzw_min_code_size() == 2
+    # 图像描述符（10字节）之后紧跟LZW最小码长
+    assert data[data.index(b',') + 10] == 2
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        assert image.getpixel((0, 0)) == (255, 255, 255)
+        assert image.getpixel((SIZE[0] - 1, 0)) == (0, 0, 0)
+
+def test_encode_keeps_frame_count_delay_and_loop():
+    encoder = SimpleGifEncoder(backend='direct')
+    encoder.setSize(*SIZE)
+    encoder.setDelay(120)
+    encoder.setRepeat(3)
+    frames = _gradient_frames(5)
+    for frame in frames:
+        encoder.addFrame(frame.resize((64, 48)))
+
+    data = encoder.encode_to_bytes()
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == SIZE
+        assert image.n_frames == 5
+        assert image.info['duration'] == 120
+        assert image.info['loop'] == 3
+    assert _decode(data) == [frame.getpixel((0, 0)) for frame in frames]
+
+def test_palette_from_every_frame_skips_miss_check(monkeypatch):
+    """全局调色板由全部帧计算时不再逐帧检查缺色"""
+    def fail(*args):
+        raise AssertionError("不应检查缺色")
+    monkeypatch.setattr(SimpleGifEncoder, '_palette_misses', fail)
+
+    frames = _gradient_frames(5)
+    assert _decode(_stream(frames)) == [frame.getpixel((0, 0)) for frame in frames]
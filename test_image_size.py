@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图片尺寸读取测试
+"""
+
+import pytest
+from PIL import Image
+
+from utils import get_image_size
+
+@pytest.mark.parametrize('fmt, kwargs', [
+    ('PNG', {}),
+    ('GIF', {}),
+    ('JPEG', {}),
+    ('JPEG', {'progressive': True}),
+    ('JPEG', {'exif': Image.Exif().tobytes(), 'icc_profile': b'\0' * 3000}),
+    ('BMP', {}),
+    ('WEBP', {}),
+])
+def test_get_image_size_matches_pillow(tmp_path, fmt, kwargs):
+    path = tmp_path / f'image.{fmt.lower()}'
+    Image.new('RGB', (321, 123), 'red').save(path, fmt, **kwargs)
+
+    assert tuple(get_image_size(str(path))) == (321, 123)
+
+def test_get_image_size_large_png_without_decoding(tmp_path):
+    """只读取文件头：截断的大图也能得到尺寸"""
+    path = tmp_path / 'big.png'
+    Image.new('L', (5000, 4000)).save(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:100])
+
+    assert tuple(get_image_size(str(path))) == (5000, 4000)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图片转PDF文件排序测试
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('img2pdf')
+
+_spec = importlib.util.spec_from_file_location(
+    'pic2pdf_app', os.path.join(os.path.dirname(__file__), 'pic2pdf', '图片生成PDF.py')
+)
+pic2pdf_app = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pic2pdf_app)
+
+def test_natural_key_orders_numbers_by_value():
+    names = ['img10.jpg', 'img2.jpg', 'IMG1.jpg', 'img2b.jpg', 'a.jpg']
+
+    assert sorted(names, key=pic2pdf_app.natural_key) == [
+        'a.jpg', 'IMG1.jpg', 'img2.jpg', 'img2b.jpg', 'img10.jpg'
+    ]
+
+def test_natural_key_multiple_number_groups():
+    names = ['2024-10-3.png', '2024-9-12.png', '2024-10-12.png']
+
+    assert sorted(names, key=pic2pdf_app.natural_key) == [
+        '2024-9-12.png', '2024-10-3.png', '2024-10-12.png'
+    ]
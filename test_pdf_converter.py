@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF页面编码测试
+"""
+
+import pytest
+from PIL import Image
+
+from modules.pdf_converter import _encode_page, _PAGE_PIXELS
+from modules.pdf_writer import read_jpeg_page
+
+def _save_jpeg(path, size, dpi=None, orientation=1):
+    exif = Image.Exif()
+    if orientation != 1:
+        exif[0x0112] = orientation
+    kwargs = {'exif': exif.tobytes()}
+    if dpi is not None:
+        kwargs['dpi'] = dpi
+    Image.new('RGB', size, 'gray').save(path, 'JPEG', **kwargs)
+    return str(path)
+
+def _page_pt(path):
+    """页面尺寸（pt，保留一位小数）"""
+    page = read_jpeg_page(path)
+    return round(page[3], 1), round(page[4], 1)
+
+@pytest.mark.parametrize('dpi', [(300, 300), (150, 200), None])
+def test_reencoded_page_keeps_source_size(tmp_path, dpi):
+    """重新编码的页面与原文件直接嵌入时的页面尺寸一致"""
+    source = _save_jpeg(tmp_path / 'a.jpg', (620, 877), dpi=dpi)
+
+    assert _encode_page(source, 100, str(tmp_path / 'p100.jpg')) == source
+    page = _encode_page(source, 95, str(tmp_path / 'p95.jpg'))
+
+    assert page != source
+    assert _page_pt(page) == _page_pt(source)
+
+def test_rotated_page_swaps_size_and_dpi(tmp_path):
+    source = _save_jpeg(tmp_path / 'a.jpg', (620, 877), dpi=(150, 300), orientation=6)
+
+    page = _encode_page(source, 100, str(tmp_path / 'p.jpg'))
+
+    width_pt, height_pt = _page_pt(source)
+    assert _page_pt(page) == (height_pt, width_pt)
+    with Image.open(page) as img:
+        assert img.size == (877, 620)
+
+def test_downscaled_page_keeps_physical_size(tmp_path):
+    """缩小到页面分辨率时DPI同比降低，页面物理尺寸不变"""
+    source = _save_jpeg(tmp_path / 'a.jpg', (4960, 7016), dpi=(600, 600))
+
+    for quality in (100, 95):
+        page = _encode_page(source, quality, str(tmp_path / f'p{quality}.jpg'), _PAGE_PIXELS['A4'])
+        with Image.open(page) as img:
+            assert img.width <= 2480 and img.height <= 3508
+        width_pt, height_pt = _page_pt(page)
+        assert abs(width_pt - 595.2) < 1 and abs(height_pt - 841.9) < 1
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JPEG页面PDF写出测试
+"""
+
+import re
+
+import pytest
+from PIL import Image
+
+from modules.pdf_writer import read_jpeg_page, write_jpeg_pdf
+
+def _save_jpeg(path, size, mode='RGB', **kwargs):
+    Image.new(mode, size, 128).save(path, 'JPEG', **kwargs)
+    return str(path)
+
+def _write_pdf(path, page_files):
+    pages = [read_jpeg_page(page) for page in page_files]
+    with open(path, 'wb') as fp:
+        write_jpeg_pdf(fp, page_files, pages)
+    return path.read_bytes()
+
+def test_read_jpeg_page_uses_dpi_for_page_size(tmp_path):
+    page = read_jpeg_page(_save_jpeg(tmp_path / 'a.jpg', (300, 150), dpi=(150, 150)))
+
+    width, height, mode, width_pt, height_pt, icc_profile, adobe = page
+    assert (width, height, mode) == (300, 150, 'RGB')
+    assert (width_pt, height_pt) == (144, 72)
+    assert icc_profile is None and not adobe
+
+def test_read_jpeg_page_defaults_to_96_dpi(tmp_path):
+    page = read_jpeg_page(_save_jpeg(tmp_path / 'a.jpg', (96, 192)))
+
+    assert page[3:5] == (72, 144)
+
+def test_read_jpeg_page_rejects_non_jpeg(tmp_path):
+    png = tmp_path / 'a.png'
+    Image.new('RGB', (10, 10)).save(png)
+
+    assert read_jpeg_page(str(png)) is None
+    assert read_jpeg_page(str(tmp_path / 'missing.jpg')) is None
+
+def test_write_jpeg_pdf_structure(tmp_path):
+    page_files = [
+        _save_jpeg(tmp_path / 'a.jpg', (200, 100)),
+        _save_jpeg(tmp_path / 'b.jpg', (100, 200), mode='L'),
+    ]
+    data = _write_pdf(tmp_path / 'out.pdf', page_files)
+
+    assert data.startswith(b'%PDF-1.3')
+    assert data.rstrip().endswith(b'%%EOF')
+    assert b'/Count 2' in data
+    assert data.count(b'/Filter /DCTDecode') == 2
+    assert b'/ColorSpace /DeviceGray' in data
+    # JPEG数据原样嵌入
+    for page in page_files:
+        with open(page, 'rb') as f:
+            assert f.read() in data
+
+    # 交叉引用表中的偏移量指向对应对象
+    xref_offset = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    entries = data[xref_offset:].split(b'\n')[3:]
+    for num, entry in enumerate(entries[:data.count(b' 0 obj\n')], start=1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b'%d 0 obj' % num)
+
+def test_write_jpeg_pdf_opens_with_pikepdf(tmp_path):
+    pikepdf = pytest.importorskip('pikepdf')
+    page_files = [_save_jpeg(tmp_path / f'{i}.jpg', (120 + i, 80)) for i in range(3)]
+    path = tmp_path / 'out.pdf'
+    _write_pdf(path, page_files)
+
+    with pikepdf.open(path) as pdf:
+        assert len(pdf.pages) == 3
+        assert [float(pdf.pages[0].MediaBox[i]) for i in range(4)] == [0, 0, 90, 60]
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缩略图缓存测试
+"""
+
+import os
+
+from PIL import Image
+
+from modules import thumb_cache
+
+def _fill_cache(directory, count, size=100):
+    """写入 count 个缓存文件，修改时间依次递增"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"{i:03d}.webp")
+        with open(path, 'wb') as f:
+            f.write(b'\0' * size)
+        os.utime(path, (1000 + i, 1000 + i))
+        paths.append(path)
+    return paths
+
+def test_prune_removes_oldest_files_over_count_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumb_cache, 'THUMB_CACHE_DIR', str(tmp_path))
+    paths = _fill_cache(str(tmp_path), 20)
+
+    removed = thumb_cache.prune_cache(max_files=10, max_bytes=10 ** 9)
+
+    assert removed == 12
+    assert [os.path.exists(p) for p in paths] == [False] * 12 + [True] * 8
+
+def test_prune_respects_byte_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumb_cache, 'THUMB_CACHE_DIR', str(tmp_path))
+    _fill_cache(str(tmp_path), 10, size=1000)
+
+    thumb_cache.prune_cache(max_files=100, max_bytes=5000)
+
+    assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) <= 4000
+
+def test_prune_within_limits_keeps_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumb_cache, 'THUMB_CACHE_DIR', str(tmp_path))
+    _fill_cache(str(tmp_path), 5)
+
+    assert thumb_cache.prune_cache(max_files=10, max_bytes=10 ** 9) == 0
+    assert len(os.listdir(tmp_path)) == 5
+
+def test_cache_hit_refreshes_mtime(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(thumb_cache, 'THUMB_CACHE_DIR', str(cache_dir))
+    source = tmp_path / 'a.png'
+    Image.new('RGB', (300, 200), 'blue').save(source)
+
+    first = thumb_cache.get_thumbnail(str(source))
+    cache_file = thumb_cache._cache_path(str(source), os.stat(source).st_mtime, (100, 100))
+    os.utime(cache_file, (1000, 1000))
+    second = thumb_cache.get_thumbnail(str(source))
+
+    assert first.size == second.size == (100, 67)
+    assert os.stat(cache_file).st_mtime > 1000
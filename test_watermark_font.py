@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+水印自适应字号测试
+"""
+
+import pytest
+from PIL import ImageFont
+
+from modules.watermark_tool import _calculate_adaptive_font_size, _text_bbox
+
+_FONT = 'DejaVuSans.ttf'
+
+@pytest.fixture(scope='module')
+def params():
+    try:
+        ImageFont.truetype(_FONT, 10)
+    except OSError:
+        pytest.skip(f"未找到字体 {_FONT}")
+    return {'font_chinese': _FONT, 'font_english': _FONT, 'font_size': 36}
+
+def _width(text, size):
+    bbox = _text_bbox(text, _FONT, size)
+    return bbox[2] - bbox[0]
+
+@pytest.mark.parametrize('image_size', [(800, 600), (1920, 1080), (400, 1200)])
+def test_largest_size_within_80_percent_width(params, image_size):
+    text = 'Sample Watermark'
+    size = _calculate_adaptive_font_size(text, image_size, params)
+
+    max_size = int(min(image_size) * 0.3)
+    assert _width(text, size) <= image_size[0] * 0.8
+    assert size == max_size or _width(text, size + 1) > image_size[0] * 0.8
+
+def test_result_independent_of_reference_size(params):
+    text = 'Sample Watermark'
+    sizes = {
+        _calculate_adaptive_font_size(text, (1200, 900), dict(params, font_size=font_size))
+        for font_size in (12, 36, 120)
+    }
+    assert len(sizes) == 1
+
+def test_small_image_uses_minimum_size(params):
+    assert _calculate_adaptive_font_size('x', (30, 30), params) == 10
@@ -8,10 +8,15 @@
 import os
 import sys
 import logging
+import struct
+import functools
 import traceback
 from typing import Optional, Tuple, List
 from pathlib import Path
 
+# JPEG 帧头（SOF）标记：C0-CF 中除 C4(DHT)、C8(JPG)、CC(DAC) 以外的标记
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
 def setup_logging(name: str = "PicToolSuite") -> logging.Logger:
     """设置日志系统
 
@@ -98,21 +103,100 @@ def get_image_files(folder_path: str) -> List[str]:
     Returns:
         图片文件路径列表
     """
+    return [file_path for file_path, _, _ in _scan_image_files(folder_path, with_stat=False)]
+
+def get_image_files_info(folder_path: str) -> List[Tuple[str, int, float]]:
+    """获取文件夹中的所有图片文件及其大小、修改时间
+
+    使用 os.scandir 在枚举目录时一并取得文件信息，之后无需再逐个 stat。
+
+    Args:
+        folder_path: 文件夹路径
+
+    Returns:
+        (文件路径, 文件大小, 修改时间) 列表，按路径排序
+    """
+    return _scan_image_files(folder_path, with_stat=True)
+
+def _scan_image_files(folder_path: str, with_stat: bool) -> List[Tuple[str, int, float]]:
+    """扫描文件夹中的图片文件（不需要文件信息时大小和修改时间为0）"""
     if not os.path.isdir(folder_path):
         return []
 
     image_files = []
-    supported_extensions = get_supported_image_extensions()
+    supported_extensions = frozenset(get_supported_image_extensions())
+
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() not in supported_extensions:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                if with_stat:
+                    st = entry.stat()
+                    image_files.append((entry.path, st.st_size, st.st_mtime))
+                else:
+                    image_files.append((entry.path, 0, 0.0))
+            except OSError:
+                continue
+
+    image_files.sort()
+    return image_files
 
-    for file_name in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file_name)
-        if is_image_file(file_path):
-            image_files.append(file_path)
+def get_image_size(path: str) -> Tuple[int, int]:
+    """读取图片尺寸（PNG/JPEG/GIF直接解析文件头，其他格式交由Pillow）
 
-    return sorted(image_files)
+    只读取文件开头的几十字节（JPEG另按段长度跳过各标记段），
+    不构造Pillow图片对象，加载大文件夹的图片信息时开销更小。
 
+    Args:
+        path: 图片文件路径
+
+    Returns:
+        (宽, 高)
+    """
+    with open(path, 'rb') as f:
+        head = f.read(30)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                header = f.read(4)
+                if len(header) < 4 or header[0] != 0xFF:
+                    break
+                marker = header[1]
+                if marker == 0xFF:
+                    # 标记前的填充字节
+                    f.seek(-3, os.SEEK_CUR)
+                    continue
+                if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+                    # 无长度字段的独立标记
+                    f.seek(-2, os.SEEK_CUR)
+                    continue
+                length = struct.unpack('>H', header[2:])[0]
+                if marker in _JPEG_SOF_MARKERS:
+                    sof = f.read(5)
+                    if len(sof) < 5:
+                        break
+                    height, width = struct.unpack('>xHH', sof)
+                    if width and height:
+                        return width, height
+                    break
+                if marker == 0xDA or length < 2:
+                    break
+                f.seek(length - 2, os.SEEK_CUR)
+
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.size
+
+@functools.lru_cache(maxsize=4096)
 def format_file_size(size_bytes: int) -> str:
-    """格式化文件大小
+    """格式化文件大小（纯函数，结果缓存，重复刷新预览时不再重新计算）
 
     Args:
         size_bytes: 文件大小（字节）
@@ -387,6 +471,8 @@ def get_system_info() -> dict:
     """
     import platform
     import psutil
+    import PIL
+    from PIL import features
 
     info = {
         'platform': platform.platform(),
@@ -398,7 +484,12 @@ def get_system_info() -> dict:
         'python_version': platform.python_version(),
         'cpu_count': psutil.cpu_count(),
         'memory_total': format_file_size(psutil.virtual_memory().total),
-        'memory_available': format_file_size(psutil.virtual_memory().available)
+        'memory_available': format_file_size(psutil.virtual_memory().available),
+        'pillow_version': PIL.__version__,
+        # Pillow-SIMD 的版本号带 .postN 后缀
+        'pillow_simd': '.post' in PIL.__version__,
+        # Pillow官方发行包自带libjpeg-turbo（SIMD加速的JPEG编解码）
+        'libjpeg_turbo': features.version_feature('libjpeg_turbo')
     }
 
     return info